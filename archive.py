@@ -0,0 +1,140 @@
+"""
+author: edacjos
+created: 10/18/2026
+"""
+
+import json
+import threading
+import numpy as np
+from brain import BrainStack, Topology
+from support import Const
+
+
+class GenerationArchive:
+    """Append-only archive of the brains and fitness of every generation of a run.
+
+    Brains are appended as raw float32 BrainStack matrices and fitness as raw
+    float64 blocks to two data files, located through a small index of
+    (generation_id, size, brains offset, fitness offset) records. A record is
+    written only after its data and the header is committed atomically, so a
+    crash never exposes a torn generation. Reading a generation maps its
+    blocks from disk without loading the rest of the archive.
+    """
+
+    # format 1 stored brains as float64 blocks, one per parameter, and is still read and extended.
+    # Format 3 adds the topology of the brains, older archives are all of the legacy topology
+    FORMAT_VERSION = 3
+    READABLE_FORMATS = (1, 2, 3)
+    DTYPE = np.float64
+    BRAINS_DTYPE = {1: np.float64, 2: np.float32, 3: np.float32}
+    INDEX_FIELDS = 4
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.path = storage.archive
+        self.lock = threading.Lock()
+        self.header_path = self.path / 'archive.json'
+        self.brains_path = self.path / 'brains.bin'
+        self.fitness_path = self.path / 'fitness.bin'
+        self.index_path = self.path / 'index.bin'
+
+        self.topology = None
+        self.format = self.FORMAT_VERSION
+        if self.header_path.exists():
+            with open(self.header_path, 'r') as header_file:
+                header = json.load(header_file)
+            if header['format'] not in self.READABLE_FORMATS or int(header['version']) != int(Const.VERSION):
+                raise ValueError('Inconsistent versions!')
+            self.format = header['format']
+            self.topology = Topology.from_dict(header['topology']) if 'topology' in header else Topology.legacy()
+        self.brains_dtype = self.BRAINS_DTYPE[self.format]
+
+    def write_header(self, brains):
+        self.path.mkdir(parents=True, exist_ok=True)
+        header = {'format': self.FORMAT_VERSION, 'version': Const.VERSION, 'topology': brains.topology.to_dict(),
+                  'shapes': brains.topology.shapes}
+        self.storage.atomic_write(self.header_path, lambda file: file.write(json.dumps(header).encode()))
+        self.topology = brains.topology
+
+    def index(self):
+        """Records of all archived generations, one row per generation"""
+        if not self.index_path.exists():
+            return np.zeros((0, self.INDEX_FIELDS), dtype=np.int64)
+        records = np.fromfile(self.index_path, dtype=np.int64)
+        index = records[:len(records) // self.INDEX_FIELDS * self.INDEX_FIELDS].reshape(-1, self.INDEX_FIELDS)
+
+        # records whose data did not reach the disk before a crash are dropped
+        brains_end = index[:, 2] + index[:, 1] * self.brain_size()
+        fitness_end = index[:, 3] + index[:, 1]
+        complete = ((brains_end * self.brains_dtype().itemsize <= self.file_size(self.brains_path))
+                    & (fitness_end * self.DTYPE().itemsize <= self.file_size(self.fitness_path)))
+        return index[:np.argmin(complete) if not complete.all() else len(index)]
+
+    @staticmethod
+    def file_size(path):
+        return path.stat().st_size if path.exists() else 0
+
+    def __len__(self):
+        return len(self.index())
+
+    def generation_ids(self):
+        return self.index()[:, 0]
+
+    def append(self, generation_id, brains, fitness):
+        with self.lock:
+            if self.topology is None:
+                self.write_header(brains)
+            elif brains.topology != self.topology:
+                raise ValueError(f'Cannot archive brains of {brains.topology} with brains of {self.topology}')
+            index = self.index()
+            brains_offset = int(index[-1, 2] + index[-1, 1] * self.brain_size()) if len(index) else 0
+            fitness_offset = int(index[-1, 3] + index[-1, 1]) if len(index) else 0
+
+            with open(self.brains_path, 'r+b' if brains_offset else 'wb') as brains_file:
+                brains_file.seek(brains_offset * self.brains_dtype().itemsize)
+                blocks = [getattr(brains, name) for name in self.topology.parameters]
+                for block in [brains.params] if self.format > 1 else blocks:
+                    np.ascontiguousarray(block, dtype=self.brains_dtype).tofile(brains_file)
+            with open(self.fitness_path, 'r+b' if fitness_offset else 'wb') as fitness_file:
+                fitness_file.seek(fitness_offset * self.DTYPE().itemsize)
+                np.asarray(fitness, dtype=self.DTYPE).tofile(fitness_file)
+
+            record = np.array([generation_id, len(brains), brains_offset, fitness_offset], dtype=np.int64)
+            with open(self.index_path, 'ab') as index_file:
+                index_file.truncate(len(index) * self.INDEX_FIELDS * record.itemsize)
+                record.tofile(index_file)
+
+    def brain_size(self):
+        return self.topology.size if self.topology is not None else 0
+
+    def record(self, generation_id):
+        index = self.index()
+        rows = np.flatnonzero(index[:, 0] == generation_id)
+        if not len(rows):
+            raise KeyError(f'Generation {generation_id} is not archived')
+        return index[rows[-1]]
+
+    def brains(self, generation_id):
+        """BrainStack of a generation, mapped from disk"""
+        _, size, offset, _ = self.record(generation_id)
+        data = np.memmap(self.brains_path, dtype=self.brains_dtype, mode='r',
+                         offset=int(offset) * self.brains_dtype().itemsize, shape=(int(size) * self.brain_size(),))
+        if self.format > 1:
+            return BrainStack.from_params(data.reshape(int(size), self.brain_size()), self.topology)
+        arrays = {}
+        start = 0
+        for name, shape in self.topology.shapes.items():
+            stop = start + int(size) * int(np.prod(shape))
+            arrays[name] = data[start:stop].reshape((int(size), *shape))
+            start = stop
+        return BrainStack.from_arrays(arrays, self.topology)
+
+    def fitness(self, generation_id):
+        """Fitness array of a generation, mapped from disk"""
+        _, size, _, offset = self.record(generation_id)
+        return np.memmap(self.fitness_path, dtype=self.DTYPE, mode='r',
+                         offset=int(offset) * self.DTYPE().itemsize, shape=(int(size),))
+
+    def top_brain(self, generation_id):
+        """SnakeBrain of the fittest snake of a generation"""
+        return self.brains(generation_id).brain(int(np.argmax(self.fitness(generation_id))))
@@ -0,0 +1,198 @@
+"""
+author: edacjos
+created: 10/18/2026
+"""
+
+import numpy as np
+from support import Const
+from engine import SnakeEngine
+from brain import BrainStack
+from profiling import NO_TIMER
+
+
+class BatchEngine:
+    """Plays the same game as SnakeEngine for a whole population in lockstep.
+
+    Every snake owns a row of flat arrays: the board is stored as the step at
+    which the snake's head entered each cell, so a cell belongs to the tail
+    while `step - tail_len <= entered < step`. Moving and growing never touch
+    the old body, a turn is a handful of array operations for all snakes.
+    Free cells are kept per snake the way FreeCells keeps them, with the
+    cells entered by the head in a ring to know which one the tail leaves.
+    """
+
+    EMPTY = np.iinfo(np.int32).min // 2
+    DECISIONS = np.array(SnakeEngine.DECISIONS)
+    SENSOR = SnakeEngine.SENSOR
+
+    def __init__(self, brains, seeds=None, timer=None):
+        self.brains = brains if isinstance(brains, BrainStack) else BrainStack(brains)
+        self.timer = timer if timer is not None else NO_TIMER
+        # one apple generator per snake keeps a game independent of the rest of the batch,
+        # and identical to the one SnakeEngine plays with the same seed
+        self.rngs = None if seeds is None else [np.random.default_rng(seed) for seed in seeds]
+        self.rng = np.random.default_rng()
+        self.n = len(brains)
+        self.size = Const.NUM_OF_SQUARES
+        self.step_id = 0
+
+        # the extra cell stands for the wall in the sensor's rays
+        self.entered = np.full((self.n, self.size * self.size + 1), self.EMPTY, dtype=np.int32)
+        self.trail = np.zeros((self.n, self.size * self.size), dtype=np.int32)
+        self.free_cells = np.tile(np.arange(self.size * self.size, dtype=np.int32), (self.n, 1))
+        self.free_slots = self.free_cells.copy()
+        self.n_free = np.full(self.n, self.size * self.size)
+        every = np.arange(self.n)
+        for age, cell in enumerate(reversed([*SnakeEngine.START_TAIL, SnakeEngine.START_HEAD])):
+            self.entered[:, self.cell_index(*cell)] = -age
+            self.trail[:, -age % self.trail.shape[1]] = self.cell_index(*cell)
+        for cell in [*SnakeEngine.START_TAIL, SnakeEngine.START_HEAD]:
+            self.take(every, np.full(self.n, self.cell_index(*cell)))
+
+        self.heads = np.tile(SnakeEngine.START_HEAD, (self.n, 1))
+        self.directions = np.tile(SnakeEngine.START_DIRECTION, (self.n, 1))
+        self.tail_len = np.full(self.n, len(SnakeEngine.START_TAIL))
+        self.apples = np.zeros((self.n, 2), dtype=int)
+
+        self.alive = np.ones(self.n, dtype=bool)
+        self.won = np.zeros(self.n, dtype=bool)
+        self.death = np.full(self.n, SnakeEngine.ALIVE, dtype=np.int8)
+        # decision of every snake at every step, grown as the longest game goes on
+        self.decisions = np.zeros((self.n, SnakeEngine.START_LIFE), dtype=np.uint8)
+        self.decided = np.zeros(self.n, dtype=int)
+        self.score = np.zeros(self.n, dtype=int)
+        self.moves_done = np.zeros(self.n, dtype=int)
+        self.left_to_live = np.full(self.n, SnakeEngine.START_LIFE)
+
+        self.locate_apples(np.arange(self.n))
+
+    @property
+    def fitness(self):
+        return np.ldexp(self.moves_done.astype(float) ** 2, self.tail_len)
+
+    def cell_index(self, x, y):
+        return y * self.size + x
+
+    def die(self, idx, cause):
+        self.alive[idx] = False
+        self.death[idx] = cause
+
+    def take(self, idx, cells):
+        """Removes cells from the free cells of snakes idx, one cell per snake"""
+        slots = self.free_slots[idx, cells]
+        self.n_free[idx] -= 1
+        last = self.n_free[idx]
+        moved = self.free_cells[idx, last]
+        self.free_cells[idx, slots] = moved
+        self.free_slots[idx, moved] = slots
+        self.free_cells[idx, last] = cells
+
+    def free(self, idx, cells):
+        """Adds cells to the free cells of snakes idx, one cell per snake"""
+        slots = self.n_free[idx]
+        self.free_cells[idx, slots] = cells
+        self.free_slots[idx, cells] = slots
+        self.n_free[idx] += 1
+
+    def locate_apples(self, idx):
+        """Places an apple on a free cell of snakes idx, a snake filling the board wins"""
+        full = self.n_free[idx] == 0
+        self.won[idx[full]] = True
+        self.die(idx[full], SnakeEngine.WON)
+        idx = idx[~full]
+
+        if self.rngs is not None:
+            slots = np.array([self.rngs[n].integers(self.n_free[n]) for n in idx], dtype=int)
+        else:
+            slots = self.rng.integers(0, self.n_free[idx])
+        cells = self.free_cells[idx, slots]
+        self.take(idx, cells)
+        self.apples[idx, 0] = cells % self.size
+        self.apples[idx, 1] = cells // self.size
+
+    def look(self, idx):
+        """Builds the SnakeEngine.look inputs of snakes idx, one row per snake"""
+        heads = self.cell_index(self.heads[idx, 0], self.heads[idx, 1])
+        apples = self.cell_index(self.apples[idx, 0], self.apples[idx, 1])
+        cells = self.SENSOR.cells[heads]
+
+        entered = self.entered[idx[:, None, None], cells]
+        tail_len = self.tail_len[idx, None, None]
+        tails = (entered >= self.step_id - tail_len) & (entered < self.step_id)
+        return self.SENSOR.encode(heads, cells == apples[:, None, None], tails)
+
+    def think(self, idx):
+        with self.timer.phase('sensing'):
+            inputs = self.look(idx)
+        with self.timer.phase('inference'):
+            return self.brains.decide(inputs, idx)
+
+    def step(self):
+        """Makes a turn for every living snake"""
+        idx = np.flatnonzero(self.alive)
+        if not len(idx):
+            return
+
+        self.left_to_live[idx] -= 1
+        starved = self.left_to_live[idx] < 0
+        self.die(idx[starved], SnakeEngine.STARVED)
+        idx = idx[~starved]
+
+        decisions = self.think(idx)
+        self.record(idx, decisions)
+        with self.timer.phase('movement'):
+            eaters = self.move(idx, decisions)
+
+        self.tail_len[eaters] += 1
+        self.score[eaters] += 1
+        self.left_to_live[eaters] += SnakeEngine.LIFE_PER_APPLE
+        with self.timer.phase('apples'):
+            self.locate_apples(eaters)
+
+    def move(self, idx, decisions):
+        """Moves the heads of snakes idx, killing the ones colliding, returns the snakes eating an apple"""
+        new_directions = self.DECISIONS[decisions]
+        turning = (new_directions * self.directions[idx]).sum(axis=1) == 0
+        self.directions[idx[turning]] = new_directions[turning]
+
+        heads = self.heads[idx] + self.directions[idx]
+        inside = ((heads >= 0) & (heads < self.size)).all(axis=1)
+        cells = self.cell_index(np.clip(heads[:, 0], 0, self.size - 1), np.clip(heads[:, 1], 0, self.size - 1))
+        # the end of the tail leaves its cell during this turn
+        bitten = self.entered[idx, cells] > self.step_id - self.tail_len[idx]
+        dead = ~inside | bitten
+        self.die(idx[~inside], SnakeEngine.WALL)
+        self.die(idx[inside & bitten], SnakeEngine.BODY)
+        idx, heads, cells = idx[~dead], heads[~dead], cells[~dead]
+
+        eaten = (heads == self.apples[idx]).all(axis=1)
+        # the apple's cell is taken since the apple was placed
+        movers = idx[~eaten]
+        ring = self.trail.shape[1]
+        self.free(movers, self.trail[movers, (self.step_id - self.tail_len[movers]) % ring])
+        self.take(movers, cells[~eaten])
+
+        self.step_id += 1
+        self.heads[idx] = heads
+        self.entered[idx, cells] = self.step_id
+        self.trail[idx, self.step_id % ring] = cells
+        self.moves_done[idx] += 1
+
+        return idx[eaten]
+
+    def record(self, idx, decisions):
+        if self.step_id == self.decisions.shape[1]:
+            self.decisions = np.concatenate([self.decisions, np.zeros_like(self.decisions)], axis=1)
+        self.decisions[idx, self.step_id] = decisions
+        self.decided[idx] = self.step_id + 1
+
+    def log(self):
+        """Decisions of all snakes one after another, and the number of decisions of each"""
+        taken = np.arange(self.decisions.shape[1]) < self.decided[:, None]
+        return self.decisions[taken], self.decided.copy()
+
+    def play(self):
+        """Plays until every snake dies and returns their fitness"""
+        while self.alive.any():
+            self.step()
+        return self.fitness
@@ -0,0 +1,221 @@
+"""
+author: edacjos
+created: 10/18/2026
+
+Headless training benchmarks, e.g.
+    python benchmarks.py --sizes 100 1000 --output benchmarks.jsonl
+Every run prints a summary and can append one JSON line of results per run to a file,
+to compare commits or network topologies.
+"""
+
+import io
+import os
+import argparse
+import json
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from brain import ACTIVATIONS, SnakeBrain, BrainStack, Topology
+from engine import SnakeEngine
+from batch_engine import BatchEngine
+from checkpoint import save_generation, load_generation
+from population import Population
+from storage import Storage
+from support import Const
+
+
+# snakes played one by one by the SnakeEngine benchmark, whatever the population size
+ENGINE_SAMPLE = 200
+
+
+def best_time(function, repeat=5):
+    """Shortest time of a few runs of function, and the result of the last one"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def rate(function, count, repeat=5):
+    """Best number of items per second processed by function over a few runs"""
+    return count / best_time(function, repeat)[0]
+
+
+def random_brains(population_size):
+    return [SnakeBrain(np.random.default_rng(idx)) for idx in range(population_size)]
+
+
+def allocated(function):
+    """Peak memory allocated while running function, in bytes"""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_decisions(population_size=1000):
+    brains = random_brains(population_size)
+    stack = BrainStack(brains)
+    inputs = np.random.random((population_size, SnakeBrain.INPUTS))
+
+    def per_snake():
+        for brain, input_data in zip(brains, inputs):
+            np.argmax(brain.analyze(input_data))
+
+    def batched():
+        stack.decide(inputs)
+
+    return {
+        'per_snake': rate(per_snake, population_size),
+        'batched': rate(batched, population_size)
+    }
+
+
+def bench_engine(population_size=1000):
+    """Steps per second of SnakeEngine on a sample of snakes and of BatchEngine on all of them"""
+    brains = random_brains(population_size)
+    sample = brains[:ENGINE_SAMPLE]
+
+    def per_snake():
+        games = [SnakeEngine(brain, rng=np.random.default_rng(idx)) for idx, brain in enumerate(sample)]
+        for game in games:
+            game.play()
+        return sum(len(game.decisions) for game in games)
+
+    def batched():
+        games = BatchEngine(brains, np.arange(population_size))
+        games.play()
+        return int(games.decided.sum())
+
+    seconds, steps = best_time(per_snake, 3)
+    batch_seconds, batch_steps = best_time(batched, 3)
+    return {
+        'per_snake': steps / seconds,
+        'batched': batch_steps / batch_seconds
+    }
+
+
+def bench_generations(population_size=1000, generations=3):
+    """Generations per minute of Population.run_generation, saving included"""
+    size = Const.POPULATION_SIZE
+    Const.POPULATION_SIZE = population_size
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            population = Population(Storage(directory), 'restart', verbose=False)
+            population.run_generation()
+
+            def train():
+                for _ in range(generations):
+                    population.run_generation()
+                population.flush()
+
+            seconds = best_time(train, 1)[0]
+            population.close()
+    finally:
+        Const.POPULATION_SIZE = size
+    return 60 * generations / seconds
+
+
+def bench_checkpoint(population_size=1000):
+    """Seconds to save and to load a whole generation"""
+    brains = BrainStack(random_brains(population_size))
+    with tempfile.TemporaryDirectory() as directory:
+        path = f'{directory}/generation.npz'
+        save = best_time(lambda: save_generation(path, brains, 0, 0))[0]
+        load = best_time(lambda: load_generation(path))[0]
+    return {'save_s': save, 'load_s': load}
+
+
+def bench_memory(population_size=1000):
+    """Bytes per snake of its brain and of its game in both engines"""
+    brains = random_brains(population_size)
+    sample = brains[:ENGINE_SAMPLE]
+    buffer = io.BytesIO()
+    save_generation(buffer, BrainStack(brains), 0, 0)
+    return {
+        'brain': allocated(lambda: BrainStack(brains)) / population_size,
+        'engine': allocated(lambda: [SnakeEngine(brain) for brain in sample]) / len(sample),
+        'batch_engine': allocated(lambda: BatchEngine(brains, np.arange(population_size))) / population_size,
+        'checkpoint': buffer.tell() / population_size
+    }
+
+
+def commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, generations=3):
+    """All benchmarks at every population size, as one JSON serializable record"""
+    results = {}
+    for size in sizes:
+        results[str(size)] = {
+            'decisions_per_s': bench_decisions(size),
+            'steps_per_s': bench_engine(size),
+            'generations_per_min': bench_generations(size, generations),
+            'checkpoint': bench_checkpoint(size),
+            'bytes_per_snake': bench_memory(size)
+        }
+    return {
+        'commit': commit(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'workers': Const.WORKERS,
+        'topology': Topology().to_dict(),
+        'results': results
+    }
+
+
+def summary(record):
+    for size, result in record['results'].items():
+        decisions, steps = result['decisions_per_s'], result['steps_per_s']
+        memory = result['bytes_per_snake']
+        print(f'{size:>6} snakes: {decisions["per_snake"]:>12,.0f} decisions/s per snake, '
+              f'{decisions["batched"]:>12,.0f} decisions/s batched '
+              f'(x{decisions["batched"] / decisions["per_snake"]:.1f})')
+        print(f'{"":>14}{steps["per_snake"]:>12,.0f} steps/s per snake, '
+              f'{steps["batched"]:>17,.0f} steps/s batched')
+        print(f'{"":>14}{result["generations_per_min"]:>12,.1f} generations/min, checkpoint save '
+              f'{result["checkpoint"]["save_s"] * 1000:.1f} ms, load {result["checkpoint"]["load_s"] * 1000:.1f} ms')
+        print(f'{"":>14}bytes per snake: brain {memory["brain"]:,.0f}, engine {memory["engine"]:,.0f}, '
+              f'batch engine {memory["batch_engine"]:,.0f}, checkpoint {memory["checkpoint"]:,.0f}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark headless training.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000], help='population sizes')
+    parser.add_argument('--generations', type=int, default=3, help='generations timed end to end')
+    parser.add_argument('--hidden-layers', type=int, nargs='+', help='sizes of the hidden layers of the brains')
+    parser.add_argument('--activations', nargs='+', choices=sorted(ACTIVATIONS),
+                        help='activation of all layers, or one per layer from input to output')
+    parser.add_argument('--fused-activations', action='store_true', help='compute activations in place')
+    parser.add_argument('--output', help='append the results as a JSON line to this file')
+    args = parser.parse_args(argv)
+
+    if args.hidden_layers:
+        Const.HIDDEN_LAYERS = tuple(args.hidden_layers)
+    if args.activations:
+        Const.ACTIVATIONS = args.activations[0] if len(args.activations) == 1 else tuple(args.activations)
+    Const.FUSED_ACTIVATIONS = Const.FUSED_ACTIVATIONS or args.fused_activations
+
+    record = run(args.sizes, args.generations)
+    summary(record)
+    if args.output:
+        with open(args.output, 'a') as output:
+            output.write(json.dumps(record) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -82,6 +82,7 @@ class StatisticBoardAI(StatisticBoard):
         self.generation_id = 0
         self.snake_id = 0
         self.snakes_total = snakes_total
+        self.watch = ''
 
         super().__init__()
 
@@ -97,6 +98,8 @@ class StatisticBoardAI(StatisticBoard):
                          fill='white', anchor=tk.W, tag='population')
         self.create_text(10, 90, text=f'Snake: {self.snake_id + 1}/{self.snakes_total}', font=Const.S_F,
                          fill='white', anchor=tk.W, tag='snake')
+        self.create_text(10, 110, text=f'Watch: {self.watch}', font=Const.S_F,
+                         fill='white', anchor=tk.W, tag='watch')
 
     def update_population(self, population_id):
         self.generation_id = population_id
@@ -106,6 +109,10 @@ class StatisticBoardAI(StatisticBoard):
         self.snake_id = snake_id
         self.itemconfigure('snake', text=f'Snake: {self.snake_id + 1}/{self.snakes_total}')
 
+    def update_watch(self, mode, draw_every):
+        self.watch = f'{mode}, 1/{draw_every} steps'
+        self.itemconfigure('watch', text=f'Watch: {self.watch}')
+
     def update_info_(self, level, score, h_score, population_id, snake_id):
         super().update_info(level, score, h_score)
         self.update_population(population_id)
@@ -0,0 +1,55 @@
+"""
+author: edacjos
+created: 10/18/2026
+"""
+
+from free_cells import cell_array
+
+
+class SnakeBody:
+    """Tail of a snake as a ring buffer of cell indices with an occupancy bitmap.
+
+    A turn pushes the old head cell and pops the end of the tail unless the
+    snake grows, and checking whether a cell is taken is a single lookup, so
+    the cost of a turn does not depend on the snake's length.
+    """
+
+    def __init__(self, capacity, cells=()):
+        self.cells = cell_array([0] * capacity, capacity)
+        self.occupied = bytearray(capacity)
+        self.start = 0
+        self.length = 0
+        for cell in cells:
+            self.push(cell)
+
+    def __len__(self):
+        return self.length
+
+    def __contains__(self, cell):
+        return self.occupied[cell] > 0
+
+    def __iter__(self):
+        """Cells from the end of the tail to the one next to the head"""
+        capacity = len(self.cells)
+        for idx in range(self.start, self.start + self.length):
+            yield self.cells[idx % capacity]
+
+    @property
+    def end(self):
+        return self.cells[self.start]
+
+    def push(self, cell):
+        """Adds a cell next to the head"""
+        if self.length == len(self.cells):
+            raise OverflowError('Snake body is full!')
+        self.cells[(self.start + self.length) % len(self.cells)] = cell
+        self.occupied[cell] += 1
+        self.length += 1
+
+    def pop(self):
+        """Removes the end of the tail and returns its cell"""
+        cell = self.cells[self.start]
+        self.occupied[cell] -= 1
+        self.start = (self.start + 1) % len(self.cells)
+        self.length -= 1
+        return cell
@@ -0,0 +1,341 @@
+"""
+author: edacjos
+created: 7/10/19
+last modified: 10/18/2026
+"""
+
+import numpy as np
+from support import Const
+
+
+def sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+def relu(x):
+    return np.maximum(x, 0)
+
+
+def fused_sigmoid(x):
+    """Sigmoid as 0.5 * (1 + tanh(x / 2)) in place: one transcendental and no overflow of exp"""
+    x *= .5
+    np.tanh(x, out=x)
+    x += 1
+    x *= .5
+    return x
+
+
+def fused_tanh(x):
+    return np.tanh(x, out=x)
+
+
+def fused_relu(x):
+    return np.maximum(x, 0, out=x)
+
+
+ACTIVATIONS = {'sigmoid': sigmoid, 'tanh': np.tanh, 'relu': relu}
+FUSED_ACTIVATIONS = {'sigmoid': fused_sigmoid, 'tanh': fused_tanh, 'relu': fused_relu}
+
+
+def layout(shapes):
+    """Slice of every parameter of the given shapes in a flat vector, and the size of the vector"""
+    slices = {}
+    start = 0
+    for name, shape in shapes.items():
+        stop = start + int(np.prod(shape))
+        slices[name] = slice(start, stop)
+        start = stop
+    return slices, start
+
+
+class Topology:
+    """Layer sizes and activations of a snake's network, and the layout of its parameters.
+
+    Inputs are the 18 sensed values and outputs the 4 directions, hidden
+    layers and the activation of every layer are configurable. Weights are
+    named w_i, w_h (w_h1, w_h2... with more than two hidden layers) and w_o
+    from input to output, biases likewise, all weights coming first in the
+    flat vector. Fused activations work in place on the layer's output.
+    """
+
+    INPUTS = 18
+    OUTPUTS = 4
+
+    def __init__(self, hidden=None, activations=None, fused=None):
+        self.hidden = tuple(int(size) for size in (hidden if hidden is not None else Const.HIDDEN_LAYERS))
+        self.layers = (self.INPUTS, *self.hidden, self.OUTPUTS)
+        activations = activations if activations is not None else Const.ACTIVATIONS
+        if isinstance(activations, str):
+            activations = (activations,) * (len(self.layers) - 1)
+        self.activations = tuple(activations)
+        self.fused = bool(fused if fused is not None else Const.FUSED_ACTIVATIONS)
+
+        if not self.hidden or min(self.hidden) < 1:
+            raise ValueError('A network needs at least one hidden layer, of positive size')
+        if len(self.activations) != len(self.layers) - 1:
+            raise ValueError(f'Expected {len(self.layers) - 1} activations, one per layer')
+        unknown = set(self.activations) - set(ACTIVATIONS)
+        if unknown:
+            raise ValueError(f'Unknown activations: {", ".join(sorted(unknown))}')
+
+        middle = [''] if len(self.hidden) == 2 else [str(k) for k in range(1, len(self.hidden))]
+        self.names = ('i', *[f'h{suffix}' for suffix in middle], 'o')
+        self.shapes = {f'w_{name}': (size, previous)
+                       for name, previous, size in zip(self.names, self.layers[:-1], self.layers[1:])}
+        self.shapes.update({f'b_{name}': (size,) for name, size in zip(self.names, self.layers[1:])})
+        self.parameters = tuple(self.shapes)
+        self.slices, self.size = layout(self.shapes)
+        functions = FUSED_ACTIVATIONS if self.fused else ACTIVATIONS
+        self.functions = tuple(functions[activation] for activation in self.activations)
+
+    @classmethod
+    def legacy(cls):
+        """Network of the versions before topologies could be configured"""
+        return cls((12, 12), 'sigmoid', False)
+
+    def to_dict(self):
+        return {'hidden': list(self.hidden), 'activations': list(self.activations), 'fused': self.fused}
+
+    @classmethod
+    def from_dict(cls, dictionary):
+        return cls(dictionary['hidden'], dictionary['activations'], dictionary['fused'])
+
+    def __eq__(self, other):
+        return isinstance(other, Topology) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f'Topology({self.hidden}, {self.activations}, fused={self.fused})'
+
+    def key(self, name):
+        """Name of a layer in save_to_dict: input, hidden (hidden_1, hidden_2...) or output"""
+        return {'i': 'input', 'o': 'output'}.get(name, 'hidden' + (f'_{name[1:]}' if name[1:] else ''))
+
+    def views(self, params):
+        """Every parameter viewed in a flat vector, or in a matrix of one vector per row"""
+        lead = params.shape[:-1]
+        if params.shape[-1] != self.size:
+            raise ValueError(f'Expected {self.size} parameters for {self}, got {params.shape[-1]}')
+        return {name: params[..., self.slices[name]].reshape((*lead, *shape)) for name, shape in self.shapes.items()}
+
+    def layers_of(self, views):
+        """Weights, bias and activation of every layer, from input to output"""
+        return [(views[f'w_{name}'], views[f'b_{name}'], function)
+                for name, function in zip(self.names, self.functions)]
+
+
+class SnakeBrain:
+    """Weights and biases of a snake's network, all views of one flat float32 vector.
+
+    A clone shares the vector of its brain until one of them changes it,
+    then the changed one copies it first (copy-on-write). Parameters must
+    only be changed through the brain's methods, which take care of that.
+    """
+
+    VERSION = Const.VERSION
+    INPUTS = Topology.INPUTS
+    OUTPUTS = Topology.OUTPUTS
+    DTYPE = np.float32
+
+    def __init__(self, rng=None, params=None, topology=None):
+        self.topology = topology if topology is not None else Topology()
+        if params is None:
+            rng = rng if rng is not None else np.random.default_rng()
+            params = rng.standard_normal(self.topology.size, dtype=self.DTYPE)
+        self.shared = False
+        self.bind(params)
+
+    def bind(self, params):
+        self.params = params
+        views = self.topology.views(params)
+        for name, view in views.items():
+            setattr(self, name, view)
+        self.layers = self.topology.layers_of(views)
+
+    def analyze(self, input_data):
+        activation = input_data.astype(self.DTYPE)
+        for weights, bias, function in self.layers:
+            activation = np.matmul(weights, activation)
+            activation += bias
+            activation = function(activation)
+        return activation
+
+    @staticmethod
+    def mutation(values, rng):
+        """Adds gaussian noise to about MUTATION_RATE of the values, in place"""
+        mask = rng.random(values.shape) <= Const.MUTATION_RATE
+        values[mask] += rng.normal(Const.MU, Const.SIGMA, np.count_nonzero(mask)) / 5
+
+    @staticmethod
+    def crop_bounds(shape, count, rng):
+        """First and last flat indices of count random row-major crops of an array of shape"""
+        if len(shape) == 1:
+            start = rng.integers(0, shape[0], count)
+            stop = rng.integers(start, shape[0])
+            return start, stop
+
+        rows, cols = shape
+        start_row = rng.integers(0, rows, count)
+        end_row = rng.integers(start_row, rows)
+        start_col = rng.integers(0, cols, count)
+        end_col = rng.integers(start_col, cols + 1)
+
+        start = start_row * cols + start_col
+        stop = end_row * cols + np.minimum(end_col, cols - 1)
+        # a crop starting and ending on the same row takes the whole row
+        same_row = start_row == end_row
+        start = np.where(same_row, start_row * cols, start)
+        stop = np.where(same_row, start_row * cols + cols - 1, stop)
+        return start, stop
+
+    @staticmethod
+    def crossover_mask(topology, count, rng):
+        """Where count children take their first parent's values: a random crop of every parameter"""
+        mask = np.empty((count, topology.size), dtype=bool)
+        for name, shape in topology.shapes.items():
+            start, stop = SnakeBrain.crop_bounds(shape, count, rng)
+            flat = np.arange(int(np.prod(shape)))
+            mask[:, topology.slices[name]] = (flat >= start[:, None]) & (flat <= stop[:, None])
+        return mask
+
+    def writable(self):
+        """Gives the brain its own copy of a shared vector before it gets changed"""
+        if self.shared:
+            self.bind(self.params.copy())
+            self.shared = False
+
+    def mutate(self, rng=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        self.writable()
+        self.mutation(self.params, rng)
+
+    def clone(self):
+        """Brain sharing the vector of this one until either of them changes it"""
+        clone = SnakeBrain(params=self.params, topology=self.topology)
+        clone.shared = self.shared = True
+        return clone
+
+    def crossover(self, other, rng=None):
+        if other.topology != self.topology:
+            raise ValueError(f'Cannot cross {self.topology} with {other.topology}')
+        rng = rng if rng is not None else np.random.default_rng()
+        mask = self.crossover_mask(self.topology, 1, rng)[0]
+        return SnakeBrain(params=np.where(mask, self.params, other.params), topology=self.topology)
+
+    def save_to_dict(self):
+        topology = self.topology
+        result = {'version': self.VERSION, 'topology': topology.to_dict()}
+        result.update({f'weights_{topology.key(name)}_shape': getattr(self, f'w_{name}').shape
+                       for name in topology.names})
+        result.update({f'weights_{topology.key(name)}': getattr(self, f'w_{name}').tolist()
+                       for name in topology.names})
+        result.update({f'bias_{topology.key(name)}': getattr(self, f'b_{name}').tolist()
+                       for name in topology.names})
+        return result
+
+    def load_from_dict(self, dictionary):
+        """Reads a brain of save_to_dict, dicts without a topology are of the legacy network"""
+        if int(dictionary['version']) != int(self.VERSION):
+            raise ValueError('Inconsistent versions!')
+        topology = Topology.from_dict(dictionary['topology']) if 'topology' in dictionary else Topology.legacy()
+        arrays = {}
+        for name in topology.names:
+            arrays[f'w_{name}'] = [dictionary[f'weights_{topology.key(name)}']]
+            arrays[f'b_{name}'] = [dictionary[f'bias_{topology.key(name)}']]
+        self.topology = topology
+        self.bind(BrainStack.from_arrays(arrays, topology).params[0])
+        self.shared = False
+
+
+class BrainStack:
+    """Brains of one topology stacked as the rows of one float32 matrix, analyzed in one pass.
+
+    Parameters are views of column ranges of the matrix, as in SnakeBrain.
+    Once brains viewing its rows were handed out, the stack copies its
+    matrix before changing it, so those brains never change.
+    """
+
+    def __init__(self, brains):
+        topology = brains[0].topology
+        if any(brain.topology != topology for brain in brains):
+            raise ValueError('Brains of a stack must share their topology')
+        self.topology = topology
+        self.shared = False
+        self.bind(np.stack([brain.params for brain in brains]))
+
+    def bind(self, params):
+        self.params = params
+        views = self.topology.views(params)
+        for name, view in views.items():
+            setattr(self, name, view)
+        self.layers = self.topology.layers_of(views)
+
+    def __len__(self):
+        return len(self.params)
+
+    @classmethod
+    def from_params(cls, params, topology=None):
+        """Stack viewing a (brains, topology.size) matrix, without copying it"""
+        stack = cls.__new__(cls)
+        stack.topology = topology if topology is not None else Topology()
+        stack.shared = False
+        stack.bind(params)
+        return stack
+
+    @classmethod
+    def from_arrays(cls, arrays, topology=None):
+        """Stack of parameters given as separate arrays, one row per brain, as stored by older versions"""
+        topology = topology if topology is not None else Topology.legacy()
+        columns = []
+        for name, shape in topology.shapes.items():
+            array = np.asarray(arrays[name], dtype=SnakeBrain.DTYPE)
+            if array.shape[1:] != shape:
+                raise ValueError(f'Unexpected shape of {name}: {array.shape[1:]} instead of {shape}')
+            columns.append(array.reshape(len(array), -1))
+        return cls.from_params(np.concatenate(columns, axis=1), topology)
+
+    @classmethod
+    def random(cls, count, rng=None, topology=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        topology = topology if topology is not None else Topology()
+        return cls.from_params(rng.standard_normal((count, topology.size), dtype=SnakeBrain.DTYPE), topology)
+
+    def brain(self, idx):
+        """SnakeBrain viewing the parameters of brain idx, copied only if changed"""
+        brain = SnakeBrain(params=self.params[idx], topology=self.topology)
+        brain.shared = self.shared = True
+        return brain
+
+    def brains(self):
+        return [self.brain(idx) for idx in range(len(self))]
+
+    def writable(self):
+        """Gives the stack its own copy of a matrix viewed by brains, or mapped read-only, before it gets changed"""
+        if self.shared or not self.params.flags.writeable:
+            self.bind(self.params.copy())
+            self.shared = False
+
+    def mutate(self, rng=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        self.writable()
+        SnakeBrain.mutation(self.params, rng)
+
+    def crossover(self, first, second, rng=None):
+        """Stack of the children of brains first[k] and second[k]"""
+        rng = rng if rng is not None else np.random.default_rng()
+        mask = SnakeBrain.crossover_mask(self.topology, len(first), rng)
+        return BrainStack.from_params(np.where(mask, self.params[first], self.params[second]), self.topology)
+
+    def analyze(self, input_data, idx=None):
+        """Outputs of brains idx (all by default) for one row of inputs per brain"""
+        if idx is None:
+            idx = slice(None)
+        activation = input_data.astype(SnakeBrain.DTYPE)
+        for weights, bias, function in self.layers:
+            activation = np.matmul(weights[idx], activation[..., None])[..., 0]
+            activation += bias[idx]
+            activation = function(activation)
+        return activation
+
+    def decide(self, input_data, idx=None):
+        """Index in Const.DIRECTION_KEYS chosen by every brain"""
+        return np.argmax(self.analyze(input_data, idx), axis=1)
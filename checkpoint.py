@@ -0,0 +1,50 @@
+"""
+author: edacjos
+created: 10/18/2026
+"""
+
+import json
+import numpy as np
+from brain import BrainStack, Topology
+from support import Const
+
+
+# format 1 also stored the state of the global numpy generator, which is no longer used:
+# every random stream of a generation is derived from the seed and generation_id.
+# Formats 1 and 2 stored every parameter as a separate float64 array, format 3
+# stores the float32 matrix of a BrainStack and format 4 also its topology.
+# Generations of formats 1 to 3 are all of the legacy topology
+FORMAT_VERSION = 4
+READABLE_FORMATS = (1, 2, 3, 4)
+
+
+def save_generation(file, brains, generation_id, seed):
+    """Writes a whole generation of brains as .npz to a path or file"""
+    header = {
+        'format': FORMAT_VERSION,
+        'version': Const.VERSION,
+        'generation_id': generation_id,
+        'size': len(brains),
+        'topology': brains.topology.to_dict(),
+        'shapes': brains.topology.shapes,
+        'seed': seed
+    }
+    np.savez(file, header=np.array(json.dumps(header)), params=brains.params)
+
+
+def load_generation(path):
+    """Reads a generation written by save_generation, returns its BrainStack and header"""
+    with np.load(path) as data:
+        header = json.loads(str(data['header']))
+        if header['format'] not in READABLE_FORMATS or int(header['version']) != int(Const.VERSION):
+            raise ValueError('Inconsistent versions!')
+        topology = Topology.from_dict(header['topology']) if header['format'] >= 4 else Topology.legacy()
+        if header['format'] < 3:
+            brains = BrainStack.from_arrays({name: data[name] for name in topology.parameters}, topology)
+        else:
+            brains = BrainStack.from_params(data['params'], topology)
+
+    for name, shape in header['shapes'].items():
+        if getattr(brains, name).shape != (header['size'], *shape):
+            raise ValueError(f'Corrupted checkpoint: unexpected shape of {name}')
+    return brains, header
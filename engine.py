@@ -0,0 +1,170 @@
+"""
+author: edacjos
+created: 10/18/2026
+"""
+
+import numpy as np
+from support import Const, Direction
+from sensing import Sensor
+from body import SnakeBody
+from free_cells import FreeCells
+from profiling import NO_TIMER
+
+
+class SnakeEngine:
+    """Headless Snake game played by a SnakeBrain on a grid of cells.
+
+    Positions are (x, y) cell tuples, the canvas is never touched, so any
+    number of engines can run without a display. The Tk game only renders
+    the state kept here.
+    """
+
+    START_HEAD = (15, 15)
+    START_TAIL = [(16, 16), (16, 15)]
+    START_DIRECTION = (Direction.WEST.move_x, Direction.WEST.move_y)
+    START_LIFE = 150
+    LIFE_PER_APPLE = 60
+
+    # brain outputs are ordered as Const.DIRECTION_KEYS
+    DECISIONS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+    SENSOR = Sensor()
+    # how a game ended, filling the board is the only way to win
+    ALIVE = -1
+    DEATH_CAUSES = ('wall', 'body', 'starved', 'won')
+    WALL, BODY, STARVED, WON = range(len(DEATH_CAUSES))
+
+    def __init__(self, brain=None, apples=1, rng=None, timer=None):
+        self.brain = brain
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.timer = timer if timer is not None else NO_TIMER
+        self.size = Const.NUM_OF_SQUARES
+        self.n_apples = apples
+
+        self.head = self.START_HEAD
+        self.body = SnakeBody(self.size * self.size, [self.cell_index(*cell) for cell in self.START_TAIL])
+        self.direction = self.START_DIRECTION
+        self.apples = []
+
+        self.grid = self.SENSOR.new_grid()
+        self.grid[self.cell_index(*self.head)] = Sensor.HEAD
+        for cell in self.body:
+            self.grid[cell] = Sensor.TAIL
+        self.free = FreeCells(self.size * self.size, [*self.body, self.cell_index(*self.head)])
+
+        self.alive = True
+        self.won = False
+        self.death = self.ALIVE
+        # every decision taken, the game is replayed from them and the apple seed
+        self.decisions = bytearray()
+        self.score = 0
+        self.moves_done = 0
+        self.left_to_live = self.START_LIFE
+
+        self.locate_apples()
+
+    @property
+    def fitness(self):
+        return int(self.moves_done ** 2 * pow(2, len(self.body)))
+
+    @property
+    def tail(self):
+        """Tail cells as (x, y), tail[0] is the end and tail[-1] is next to the head"""
+        return [(cell % self.size, cell // self.size) for cell in self.body]
+
+    def inside(self, x, y):
+        return 0 <= x < self.size and 0 <= y < self.size
+
+    def cell_index(self, x, y):
+        return y * self.size + x
+
+    def locate_apples(self):
+        """Places missing apples on free cells, the snake wins once it fills the board"""
+        while len(self.apples) < self.n_apples:
+            cell = self.free.place(self.rng)
+            if cell is None:
+                break
+            self.grid[cell] = Sensor.APPLE
+            self.apples.append((cell % self.size, cell // self.size))
+
+        if not self.apples:
+            self.won = True
+            self.die(self.WON)
+
+    def die(self, cause):
+        self.alive = False
+        self.death = cause
+
+    def look(self):
+        """Builds the 18 brain inputs: apple and tail in all 8 directions, walls to the north and west"""
+        return self.SENSOR.look(self.grid, self.cell_index(*self.head))
+
+    def think(self):
+        with self.timer.phase('sensing'):
+            inputs = self.look()
+        with self.timer.phase('inference'):
+            return int(np.argmax(self.brain.analyze(inputs)))
+
+    def change_direction(self, decision):
+        new_direction = self.DECISIONS[decision]
+        # only turns are allowed, going backwards is ignored
+        if new_direction[0] * self.direction[0] + new_direction[1] * self.direction[1] == 0:
+            self.direction = new_direction
+
+    def step(self, decision=None):
+        """Makes a single turn, asking the brain for a decision if none is given"""
+        if not self.alive:
+            return
+
+        self.left_to_live -= 1
+        if self.left_to_live < 0:
+            self.die(self.STARVED)
+            return
+
+        if decision is None:
+            decision = self.think()
+        self.decisions.append(decision)
+        with self.timer.phase('movement'):
+            growing = self.move(decision)
+
+        if growing:
+            self.apples.remove(self.head)
+            self.score += 1
+            self.left_to_live += self.LIFE_PER_APPLE
+            with self.timer.phase('apples'):
+                self.locate_apples()
+
+    def move(self, decision):
+        """Moves the head, killing the snake on a collision, returns whether it ate an apple"""
+        self.change_direction(decision)
+
+        head = (self.head[0] + self.direction[0], self.head[1] + self.direction[1])
+        if not self.inside(*head):
+            self.die(self.WALL)
+            return False
+
+        cell = self.cell_index(*head)
+        growing = self.grid[cell] == Sensor.APPLE
+        # the end of the tail leaves its cell during this turn
+        if cell in self.body and cell != self.body.end:
+            self.die(self.BODY)
+            return False
+
+        old_head = self.cell_index(*self.head)
+        self.grid[old_head] = Sensor.TAIL
+        self.body.push(old_head)
+        if not growing:
+            end = self.body.pop()
+            self.grid[end] = Sensor.EMPTY
+            self.free.free(end)
+            # an apple's cell is taken since the apple was placed
+            self.free.take(cell)
+        self.grid[cell] = Sensor.HEAD
+        self.head = head
+        self.moves_done += 1
+        return growing
+
+    def play(self):
+        """Plays until the snake dies and returns its fitness"""
+        while self.alive:
+            self.step()
+        return self.fitness
@@ -0,0 +1,65 @@
+"""
+author: edacjos
+created: 10/18/2026
+"""
+
+from array import array
+
+
+def cell_array(values, capacity):
+    """Compact array of cell indices of a board of capacity cells, -1 included"""
+    return array('h' if capacity <= 2 ** 15 else 'l', values)
+
+
+class FreeCells:
+    """Cells of the board not taken by a snake or an apple.
+
+    Free cells are kept packed at the front of an array with the slot of
+    every cell in a second one. Taking a cell moves the last free cell into
+    its slot, so taking, freeing and drawing a random free cell cost the
+    same however full the board is. Both are compact arrays rather than
+    lists of Python ints, a few KB per game instead of over 100 KB.
+    """
+
+    TAKEN = -1
+
+    def __init__(self, capacity, taken=()):
+        self.cells = cell_array(range(capacity), capacity)
+        self.slots = cell_array(range(capacity), capacity)
+        self.length = capacity
+        for cell in taken:
+            self.take(cell)
+
+    def __len__(self):
+        return self.length
+
+    def __contains__(self, cell):
+        return self.slots[cell] != self.TAKEN
+
+    def take(self, cell):
+        """Marks a cell as taken, nothing happens if it already is"""
+        slot = self.slots[cell]
+        if slot == self.TAKEN:
+            return
+        self.length -= 1
+        moved = self.cells[self.length]
+        self.cells[slot] = moved
+        self.slots[moved] = slot
+        self.cells[self.length] = cell
+        self.slots[cell] = self.TAKEN
+
+    def free(self, cell):
+        """Marks a cell as free, nothing happens if it already is"""
+        if self.slots[cell] != self.TAKEN:
+            return
+        self.cells[self.length] = cell
+        self.slots[cell] = self.length
+        self.length += 1
+
+    def place(self, rng):
+        """Takes a random free cell and returns it, None if the board is full"""
+        if not self.length:
+            return None
+        cell = self.cells[int(rng.integers(self.length))]
+        self.take(cell)
+        return cell
@@ -5,11 +5,14 @@ last modified: 07/13/2019
 """
 
 import tkinter as tk
+import numpy as np
 from boards import GameBoard, StatisticBoard, StatisticBoardAI
-from snake import Snake
+from snake import Snake, SmartSnake
 from population import Population
 from support import Const
 from game_objects import Apple
+from free_cells import FreeCells
+from renderer import BoardRenderer
 
 
 class SnakeGame(tk.Frame):
@@ -20,6 +23,7 @@ class SnakeGame(tk.Frame):
         RETURN_KEY = 'Return'  # Replay
         SHIFT_L_KEY = 'Shift_L'  # Turn on/off level system
         SHIFT_R_KEY = 'Shift_R'  # Turn on/off level system
+        TAB_KEY = 'Tab'  # Switch watch mode of the AI game
 
     def __init__(self):
         super().__init__()
@@ -35,9 +39,12 @@ class SnakeGame(tk.Frame):
 
         self.apples = []
         self.snake = Snake(self)
+        self.free_cells = None
+        self.rng = np.random.default_rng()
 
         self.paused = False
         self.in_game = True
+        self.won = False
         self.level_system = True
 
         self.bind_all('<Key>', self.on_key_pressed)
@@ -46,6 +53,7 @@ class SnakeGame(tk.Frame):
     def init_game(self):
         """Initialize game objects and starts game"""
         self.snake.draw(self.board)
+        self.free_cells = FreeCells(Const.NUM_OF_SQUARES * Const.NUM_OF_SQUARES, self.snake.cells())
         self.locate_apples()
         self.statistic_board = StatisticBoard()
         self.statistic_board.grid(column=0, row=0)
@@ -55,12 +63,19 @@ class SnakeGame(tk.Frame):
         self.after_id = self.after(Const.DELAY, self.on_timer)
 
     def locate_apples(self):
-        """Locating an apple"""
+        """Locates apples on free cells, the player wins once the snake fills the board"""
         while len(self.apples) < self.level:
-            apple = Apple(self.board)
+            cell = self.free_cells.place(self.rng)
+            if cell is None:
+                break
+            apple = Apple(self.board, Snake.cell_position(cell % Const.NUM_OF_SQUARES, cell // Const.NUM_OF_SQUARES))
             apple.draw()
             self.apples.append(apple)
 
+        if not self.apples:
+            self.won = True
+            self.snake.die()
+
     def on_timer(self):
         """On timer tick function"""
         if not self.paused and self.in_game:
@@ -96,6 +111,7 @@ class SnakeGame(tk.Frame):
         self.level = 1
         self.score = 0
         self.in_game = True
+        self.won = False
 
         self.snake = Snake(self)
         self.apples = []
@@ -154,7 +170,7 @@ class SnakeGame(tk.Frame):
         font = Const.G_F
 
         self.board.create_text(self.board.winfo_width() / 2, self.board.winfo_height() / 2 - 4 * font_size,
-                               text=f'Game Over!', fill='white', font=font)
+                               text='You Win!' if self.won else 'Game Over!', fill='white', font=font)
         self.board.create_text(self.board.winfo_width() / 2, self.board.winfo_height() / 2 - 2 * font_size,
                                text=f'Score: {self.score}', fill='white', font=font)
         self.board.create_text(self.board.winfo_width() / 2, self.board.winfo_height() / 2 - 1 * font_size,
@@ -165,17 +181,25 @@ class SnakeGame(tk.Frame):
 
 class SnakeGameAI(SnakeGame):
 
+    # all: play every snake, best: train at full speed and show the top snake of each generation,
+    # threshold: like best, only for generations whose top score reaches Const.WATCH_MIN_SCORE
+    WATCH_MODES = ('all', 'best', 'threshold')
+
     def __init__(self):
         super().__init__()
         self.level_system = False
-        self.population = Population(self)
+        self.population = Population()
 
         self.delay = Const.AI_DELAY
+        self.watch = self.WATCH_MODES[0]
+        self.draw_every = 1
+        self.replaying = False
         self.statistic_board = StatisticBoardAI(self.population.size)
         self.statistic_board.grid(column=0, row=0)
         self.board.grid(column=1, row=0)
 
-        self.snake = self.population.get_snake()
+        self.renderer = BoardRenderer(self.board)
+        self.snake = SmartSnake(self, self.population.get_snake())
 
     def init_game(self):
         """Initialize game objects and starts game"""
@@ -186,15 +210,20 @@ class SnakeGameAI(SnakeGame):
 
         self.statistic_board.update_info_(self.level, self.score, self.high_score,
                                           self.population.generation_id, self.population.snake_in_game_id)
+        self.statistic_board.update_watch(self.watch, self.draw_every)
 
         self.after_id = self.after(self.delay, self.on_timer)
 
+    def locate_apples(self):
+        """Draws apples placed by the snake's engine"""
+        self.renderer.update_apples()
+
     def on_timer(self):
         """On timer tick function"""
         if not self.paused and self.in_game:
             self.after_cancel(self.after_id)
 
-            self.snake.make_turn()
+            self.snake.make_turn(self.draw_every)
             self.check_level_up()
 
             self.after_id = self.after(self.delay, self.on_timer)
@@ -213,6 +242,12 @@ class SnakeGameAI(SnakeGame):
             self.speed_up()
         elif key == Const.LEFT_KEY:
             self.slow_down()
+        elif key == Const.UP_KEY:
+            self.draw_less()
+        elif key == Const.DOWN_KEY:
+            self.draw_more()
+        elif key == self.ControlKeys.TAB_KEY:
+            self.switch_watch_mode()
 
     def speed_up(self):
         if self.delay // 2 >= Const.MIN_AI_DELAY:
@@ -222,19 +257,61 @@ class SnakeGameAI(SnakeGame):
         if self.delay * 2 <= Const.MAX_AI_DELAY:
             self.delay = self.delay * 2
 
+    def draw_less(self):
+        """Simulates twice as many steps between two frames"""
+        if self.draw_every * 2 <= Const.MAX_DRAW_EVERY:
+            self.draw_every = self.draw_every * 2
+            self.statistic_board.update_watch(self.watch, self.draw_every)
+
+    def draw_more(self):
+        if self.draw_every // 2 >= 1:
+            self.draw_every = self.draw_every // 2
+            self.statistic_board.update_watch(self.watch, self.draw_every)
+
+    def switch_watch_mode(self):
+        """Cycles watch modes, the snake on the board finishes its game first"""
+        self.watch = self.WATCH_MODES[(self.WATCH_MODES.index(self.watch) + 1) % len(self.WATCH_MODES)]
+        self.statistic_board.update_watch(self.watch, self.draw_every)
+
+    def train(self):
+        """Trains a generation at full speed, then shows its top snake if it is worth watching"""
+        if self.paused:
+            self.after_id = self.after(Const.AI_DELAY, self.train)
+            return
+        if self.watch == 'all':
+            # switched back with Tab while generations trained unwatched
+            self.show(self.population.get_snake())
+            return
+
+        self.population.run_generation()
+        self.statistic_board.update_population(self.population.generation_id)
+        if self.watch == 'best' or self.population.scores.max() >= Const.WATCH_MIN_SCORE:
+            self.show(self.population.top_game(), replaying=True)
+        else:
+            self.after_id = self.after(1, self.train)
+
+    def show(self, engine, replaying=False):
+        self.snake = SmartSnake(self, engine)
+        self.replaying = replaying
+        self.init_game()
+        self.statistic_board.update_snake(self.population.top_id if replaying else self.population.snake_in_game_id)
+        # a replayed snake belongs to the generation trained last
+        generation_id = self.population.generation_id
+        self.statistic_board.update_population(generation_id - 1 if replaying else generation_id)
+
     def replay(self):
-        """Replay"""
-        self.board.delete(tk.ALL)
+        """Replay, the renderer reuses the canvas items of the last snake"""
         self.level = 1
         self.score = 0
         self.snake.alive = False
 
-        self.snake = self.population.next_snake()
-        self.statistic_board.update_snake(self.population.snake_in_game_id)
-        self.statistic_board.update_population(self.population.generation_id)
-        self.apples = []
-
-        self.init_game()
+        if self.watch != 'all':
+            self.train()
+        elif self.replaying:
+            # training went on while the top snake was shown, the current generation is untouched
+            self.show(self.population.get_snake())
+        else:
+            self.show(self.population.next_snake())
 
     def game_over(self):
         """Game Over"""
@@ -253,6 +330,7 @@ def start_snake_ai():
     game = SnakeGameAI()
     game.init_game()
     root.mainloop()
+    game.population.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,51 @@
+"""
+author: edacjos
+created: 10/18/2026
+"""
+
+import json
+import numpy as np
+from support import Const
+
+
+class GameLog:
+    """Decisions and apple seeds of every snake of a generation.
+
+    A game is fully determined by its apple seed and the decisions taken,
+    one byte per step, so any game can be replayed by a SnakeEngine without
+    its brain. Decisions of all snakes are stored one after another.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, generation_id, seeds, fitness, actions, lengths):
+        self.generation_id = generation_id
+        self.seeds = np.asarray(seeds, dtype=np.uint32)
+        self.fitness = np.asarray(fitness, dtype=float)
+        self.actions = np.asarray(actions, dtype=np.uint8)
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(self.lengths)])
+
+    def __len__(self):
+        return len(self.seeds)
+
+    @property
+    def top_id(self):
+        return int(np.argmax(self.fitness))
+
+    def game(self, snake_id):
+        """Decisions and apple seed of a snake"""
+        return self.actions[self.offsets[snake_id]:self.offsets[snake_id + 1]], int(self.seeds[snake_id])
+
+    def save(self, file):
+        header = {'format': self.FORMAT_VERSION, 'version': Const.VERSION, 'generation_id': self.generation_id}
+        np.savez_compressed(file, header=np.array(json.dumps(header)), seeds=self.seeds, fitness=self.fitness,
+                            actions=self.actions, lengths=self.lengths)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            header = json.loads(str(data['header']))
+            if header['format'] != cls.FORMAT_VERSION or int(header['version']) != int(Const.VERSION):
+                raise ValueError('Inconsistent versions!')
+            return cls(header['generation_id'], data['seeds'], data['fitness'], data['actions'], data['lengths'])
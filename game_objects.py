@@ -4,10 +4,42 @@ created: 7/10/19
 last modified: 07/13/2019
 """
 
-import random
 from tkinter import NW
 from PIL import Image, ImageTk
-from support import Const, Position
+from support import Const
+
+
+class Sprites:
+    """Images of the game objects, decoded once per Tk root and shared by every object drawn on it.
+
+    Images are drawn for ART_SQUARE_SIZE squares and scaled to Const.SQUARE_SIZE.
+    """
+
+    FILES = {
+        'head': 'images/head.png',
+        'tail': 'images/tail.png',
+        'apple': 'images/apple.png'
+    }
+    ART_SQUARE_SIZE = 15
+
+    @classmethod
+    def get(cls, canvas, name):
+        # PhotoImages belong to the interpreter of a root, so the cache lives on the root
+        root = canvas._root()
+        if not hasattr(root, 'sprites'):
+            root.sprites = {}
+        if name not in root.sprites:
+            root.sprites[name] = ImageTk.PhotoImage(cls.load(name), master=root)
+        return root.sprites[name]
+
+    @classmethod
+    def load(cls, name):
+        image = Image.open(cls.FILES[name])
+        if Const.SQUARE_SIZE != cls.ART_SQUARE_SIZE:
+            scale = Const.SQUARE_SIZE / cls.ART_SQUARE_SIZE
+            size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            image = image.resize(size, Image.LANCZOS)
+        return image
 
 
 class GameObject:
@@ -42,7 +74,7 @@ class SnakeHead(GameObject):
         super().__init__('head', position)
 
     def draw(self, canvas):
-        self.image = ImageTk.PhotoImage(Image.open('images/head.png'))
+        self.image = Sprites.get(canvas, 'head')
         super().draw(canvas)
 
 
@@ -52,19 +84,12 @@ class SnakeTail(GameObject):
         super().__init__('tail', position)
 
     def draw(self, canvas):
-        self.image = ImageTk.PhotoImage(Image.open('images/tail.png'))
+        self.image = Sprites.get(canvas, 'tail')
         super().draw(canvas)
 
 
 class Food(GameObject):
-    def __init__(self, name, canvas):
-        rx = random.randint(Const.MIN_RAND_POS, Const.MAX_RAND_POS) * Const.SQUARE_SIZE
-        ry = random.randint(Const.MIN_RAND_POS, Const.MAX_RAND_POS) * Const.SQUARE_SIZE
-        position = Position(rx, ry)
-        while len(canvas.find_in_position(position + 10)) > 0:
-            rx = random.randint(Const.MIN_RAND_POS, Const.MAX_RAND_POS) * Const.SQUARE_SIZE
-            ry = random.randint(Const.MIN_RAND_POS, Const.MAX_RAND_POS) * Const.SQUARE_SIZE
-            position = Position(rx, ry)
+    def __init__(self, name, canvas, position):
         super().__init__(name, position, canvas)
 
     def draw(self, canvas=None):
@@ -78,6 +103,6 @@ class Food(GameObject):
 
 class Apple(Food):
 
-    def __init__(self, canvas):
-        super().__init__('apple', canvas)
-        self.image = ImageTk.PhotoImage(Image.open('images/apple.png'))
+    def __init__(self, canvas, position):
+        super().__init__('apple', canvas, position)
+        self.image = Sprites.get(canvas, 'apple')
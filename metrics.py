@@ -0,0 +1,114 @@
+"""
+author: edacjos
+created: 10/18/2026
+"""
+
+import os
+import json
+import numpy as np
+from engine import SnakeEngine
+from profiling import PhaseTimer
+from support import Const
+
+
+class MetricsLog:
+    """Append-only log of one fixed-size binary record per generation.
+
+    The schema, names and numpy types of the fields, is written once to a
+    JSON header next to the records. Appending never rewrites older
+    records, and a reader following the log reads only the records added
+    since its last read instead of the whole file. A record torn by a crash
+    is dropped when the log is opened again.
+    """
+
+    # format 2 added the persistence phase, logs of format 1 are still read and extended
+    FORMAT_VERSION = 2
+    READABLE_FORMATS = (1, 2)
+    FIELDS = [
+        ('generation_id', '<i8'),
+        ('generation_size', '<i8'),
+        ('total_fitness', '<f8'),
+        ('top_fitness', '<f8'),
+        ('fitness_p10', '<f8'),
+        ('fitness_p50', '<f8'),
+        ('fitness_p90', '<f8'),
+        ('mean_length', '<f8'),
+        ('max_length', '<i8'),
+        ('mean_moves', '<f8'),
+        *[(f'deaths_{cause}', '<i8') for cause in SnakeEngine.DEATH_CAUSES],
+        ('steps', '<i8'),
+        ('wall_s', '<f8'),
+        ('steps_per_s', '<f8'),
+        # phases are timed only with Const.PROFILE, NaN otherwise
+        *[(name, '<f8') for name in PhaseTimer.field_names()]
+    ]
+    DTYPE = np.dtype(FIELDS)
+
+    def __init__(self, storage):
+        self.storage = storage
+        # record type of the log on disk, which may be of an older format
+        self.dtype = None
+
+    @classmethod
+    def header(cls):
+        return {'format': cls.FORMAT_VERSION, 'version': Const.VERSION, 'fields': cls.FIELDS}
+
+    def append(self, metrics):
+        if self.dtype is None:
+            if self.storage.metrics_header.exists():
+                with open(self.storage.metrics_header, 'r') as header_file:
+                    header = json.load(header_file)
+                if header['format'] not in self.READABLE_FORMATS or int(header['version']) != int(Const.VERSION):
+                    raise ValueError('Inconsistent versions!')
+                self.dtype = np.dtype([tuple(field) for field in header['fields']])
+                self.drop_torn_record()
+            else:
+                self.storage.atomic_write(self.storage.metrics_header,
+                                          lambda file: file.write(json.dumps(self.header()).encode()))
+                self.dtype = self.DTYPE
+        self.storage.append(self.storage.metrics, self.pack(metrics))
+
+    def drop_torn_record(self):
+        """Truncates a record left half written by a crash, which would shift every record appended after it"""
+        path = self.storage.metrics
+        size = os.path.getsize(path) if path.exists() else 0
+        if size % self.dtype.itemsize:
+            os.truncate(path, size - size % self.dtype.itemsize)
+
+    def pack(self, metrics):
+        """Binary record of a dict of metrics, missing fields are NaN or 0"""
+        dtype = self.dtype if self.dtype is not None else self.DTYPE
+        record = np.zeros(1, dtype=dtype)
+        for name in dtype.names:
+            record[name] = metrics.get(name, np.nan if dtype[name].kind == 'f' else 0)
+        return record.tobytes()
+
+
+class MetricsReader:
+    """Follows a MetricsLog as it grows, each read returns only the new records"""
+
+    def __init__(self, storage):
+        self.records_path = storage.metrics
+        self.header_path = storage.metrics_header
+        self.dtype = None
+        self.offset = 0
+
+    def read(self):
+        """Records appended since the last read, a record still being written is left for the next one"""
+        if self.dtype is None:
+            if not self.header_path.exists():
+                return np.zeros(0, dtype=MetricsLog.DTYPE)
+            with open(self.header_path, 'r') as header_file:
+                header = json.load(header_file)
+            if header['format'] not in MetricsLog.READABLE_FORMATS:
+                raise ValueError('Inconsistent versions!')
+            self.dtype = np.dtype([tuple(field) for field in header['fields']])
+
+        if not self.records_path.exists():
+            return np.zeros(0, dtype=self.dtype)
+        with open(self.records_path, 'rb') as records_file:
+            records_file.seek(self.offset)
+            data = records_file.read()
+        count = len(data) // self.dtype.itemsize
+        self.offset += count * self.dtype.itemsize
+        return np.frombuffer(data, dtype=self.dtype, count=count)
@@ -0,0 +1,56 @@
+"""
+author: edacjos
+created: 10/18/2026
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from brain import BrainStack
+from batch_engine import BatchEngine
+from profiling import PhaseTimer
+
+
+def evaluate_shard(params, topology, seeds, timed=False):
+    """Plays a shard of a generation in a worker process, returns its results and timed phases"""
+    timer = PhaseTimer(timed)
+    games = BatchEngine(BrainStack.from_params(params, topology), seeds, timer)
+    games.play()
+    return (games.fitness, games.score, games.moves_done, games.death, *games.log()), timer.fields()
+
+
+class ParallelEvaluator:
+    """Evaluates generations on a pool of worker processes.
+
+    Snakes are split into contiguous shards played by BatchEngine in the
+    workers. Apples come from a seed per snake, so the results do not depend
+    on the number of workers or on how the generation was split.
+    """
+
+    SHARDS_PER_WORKER = 2
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(workers)
+
+    def evaluate(self, brains, seeds, timer=None):
+        """Returns fitness, score, moves and death arrays of all brains, and the BatchEngine.log of their games.
+
+        Phases timed in the workers are added to timer, their seconds summed over all workers.
+        """
+        stack = brains if isinstance(brains, BrainStack) else BrainStack(brains)
+        timed = timer is not None and timer.enabled
+        bounds = np.linspace(0, len(stack), self.workers * self.SHARDS_PER_WORKER + 1).astype(int)
+        futures = [
+            self.executor.submit(evaluate_shard, stack.params[start:stop], stack.topology, seeds[start:stop], timed)
+            for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start
+        ]
+        results = []
+        for future in futures:
+            result, phases = future.result()
+            results.append(result)
+            if timed:
+                timer.merge(phases)
+        return tuple(np.concatenate(arrays) for arrays in zip(*results))
+
+    def close(self):
+        self.executor.shutdown()
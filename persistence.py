@@ -0,0 +1,87 @@
+"""
+author: edacjos
+created: 10/18/2026
+"""
+
+import queue
+import threading
+import time
+from support import Const
+
+
+class Writer:
+    """Single background thread running persistence jobs one at a time, in order.
+
+    Jobs must only get snapshots (copied arrays, plain values), never live
+    objects the training loop keeps changing. The queue is bounded, so a
+    disk that cannot keep up slows training down instead of piling up
+    memory. Jobs submitted with a key replace older jobs of the same key
+    still waiting in the queue, e.g. only the newest full checkpoint is
+    written when generations are faster than the disk. A failed job is
+    raised by the next submit, flush or close, so training stops at the
+    first save that did not reach the disk.
+    """
+
+    def __init__(self, max_pending=Const.MAX_PENDING_SAVES):
+        self.queue = queue.Queue(max_pending)
+        self.lock = threading.Lock()
+        self.latest = {}
+        self.sequence = 0
+        self.error = None
+        # time spent running jobs, see work()
+        self.seconds = 0.
+        self.jobs = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, job, *args, key=None):
+        self.check()
+        with self.lock:
+            self.sequence += 1
+            if key is not None:
+                self.latest[key] = self.sequence
+            item = (self.sequence, key, job, args)
+        self.queue.put(item)
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                sequence, key, job, args = item
+                with self.lock:
+                    stale = key is not None and self.latest[key] != sequence
+                if not stale:
+                    start = time.perf_counter()
+                    job(*args)
+                    with self.lock:
+                        self.seconds += time.perf_counter() - start
+                        self.jobs += 1
+            except Exception as error:
+                self.error = self.error or error
+            finally:
+                self.queue.task_done()
+
+    def work(self):
+        """Seconds spent running jobs and number of jobs run since the last call"""
+        with self.lock:
+            work = self.seconds, self.jobs
+            self.seconds, self.jobs = 0., 0
+        return work
+
+    def check(self):
+        """Raises the first error of a job since the last check, if any"""
+        error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def flush(self):
+        """Waits until every submitted job is done, raising the first error of a job if any"""
+        self.queue.join()
+        self.check()
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        self.check()
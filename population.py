@@ -4,153 +4,325 @@ created: 7/10/19
 last modified: 07/13/2019
 """
 
-import os
-import random
-import threading
 import json
-import csv
-from snake import SmartSnake
+import time
+import marshal
+import cProfile
+import numpy as np
+from brain import SnakeBrain, BrainStack, Topology
+from engine import SnakeEngine
+from batch_engine import BatchEngine
+from parallel import ParallelEvaluator
+from selection import select_parents
+from archive import GenerationArchive
+from game_log import GameLog
+from profiling import PhaseTimer
+from metrics import MetricsLog
+from checkpoint import save_generation, load_generation
+from persistence import Writer
+from storage import Storage
 from support import Const
 
 
 class Population:
-    def __init__(self, game):
-        self.snakes = []
-        self.top_snake = None
-        self.game = game
+    """Snake brains of a generation, evaluated headless or one by one from the Tk game"""
+
+    # ask: prompt if a saved generation exists, resume: load it if any,
+    # restart: always start from random snakes, require: fail without one
+    RESUME_POLICIES = ('ask', 'resume', 'restart', 'require')
+    # independent random streams of every generation, all derived from the run's seed
+    APPLES, BRAINS, BREEDING = range(3)
+
+    def __init__(self, storage=None, resume='ask', verbose=True):
+        self.storage = storage if storage is not None else Storage()
+        # print progress of every generation, warnings are printed anyway
+        self.verbose = verbose
+        # brains of the generation, views of the rows of stack
+        self.stack = None
+        self.brains = []
+        self.snakes = None
+        self.top_brain = None
+        self.top_id = 0
+        self.top_seed = None
+        self.top_fitness = 0
         self.size = Const.POPULATION_SIZE
+        self.fitness = np.zeros(self.size)
+        self.scores = np.zeros(self.size, dtype=int)
+        self.moves = np.zeros(self.size, dtype=int)
+        self.deaths = np.full(self.size, SnakeEngine.ALIVE)
+        # decisions of all snakes of the last evaluation, one after another
+        self.actions = np.zeros(0, dtype=np.uint8)
+        self.lengths = np.zeros(self.size, dtype=int)
         self.snake_in_game_id = 0
         self.generation_id = 0
         self.total_fitness = 0
+        self.seed = Const.SEED if Const.SEED is not None else np.random.SeedSequence().entropy
+        self.evaluator = None
+        self.timer = PhaseTimer(Const.PROFILE)
+        self.metrics = MetricsLog(self.storage)
+        self.generation_start = time.perf_counter()
+        self.evaluation_s = None
+        self.archive = GenerationArchive(self.storage)
 
-        try:
-            with open(f'data\\V_{Const.VERSION}\\snake_0.json', 'r'):
-                chose = input('Found previous run of this version. Load last generation?[y/n] ')
-                if chose.lower() == 'y':
-                    self.load_last_generation()
-                else:
-                    self.create_snakes()
-        except FileNotFoundError:
+        if resume not in self.RESUME_POLICIES:
+            raise ValueError(f'Unknown resume policy {resume}')
+        found = self.storage.checkpoint.exists() or self.storage.legacy_snake(0).exists()
+        if resume == 'require' and not found:
+            raise FileNotFoundError(f'No saved generation in {self.storage.root}')
+
+        interactive = resume == 'ask'
+        if found and interactive:
+            chose = input('Found previous run of this version. Load last generation?[y/n] ')
+            resume = 'resume' if chose.lower() == 'y' else 'restart'
+
+        if found and resume in ('resume', 'require'):
+            self.load_last_generation(interactive)
+        else:
+            # a new run never appends to the archive and logs of another one
+            retired = self.storage.retire()
+            if retired is not None:
+                print(f'Files of the previous run moved to {retired}')
+                self.archive = GenerationArchive(self.storage)
             self.create_snakes()
+        self.check_archive()
+        self.writer = Writer()
+
+    def check_archive(self):
+        """Fails before training if the generations could not be archived with the ones already there"""
+        archived = self.archive.topology
+        if Const.ARCHIVE and archived is not None and archived != self.stack.topology:
+            raise ValueError(f'{self.archive.path} archives brains of {archived}, not {self.stack.topology}: '
+                             f'train in another checkpoint directory')
 
     def create_snakes(self):
-        for _ in range(self.size):
-            snake = SmartSnake(self.game)
-            self.snakes.append(snake)
+        self.set_brains(BrainStack.random(self.size, self.rng(self.BRAINS)))
+        self.snakes = None
 
-    def select_snake(self):
-        rand = self.total_fitness * random.random()
+    def set_brains(self, stack):
+        """Makes the brains of stack the generation's, the stack is never changed afterwards"""
+        self.stack = stack
+        self.brains = stack.brains()
 
-        cum_sum = 0
-        for snake in self.snakes:
-            cum_sum += snake.fitness
-            if cum_sum >= rand:
-                return snake
+    def games(self):
+        """SnakeEngine of every snake of the generation, created on first use"""
+        if self.snakes is None:
+            self.snakes = [SnakeEngine(brain, rng=np.random.default_rng(seed), timer=self.timer)
+                           for brain, seed in zip(self.brains, self.snake_seeds())]
+        return self.snakes
 
     def select_top_snake(self):
-        max_fitness = 0
-        for snake in self.snakes:
-            if snake.fitness > max_fitness:
-                max_fitness = snake.fitness
-                self.top_snake = snake
-        threading.Thread(target=self.save_top_snake).start()
+        top_id = int(np.argmax(self.fitness))
+        self.top_id = top_id
+        self.top_brain = self.brains[top_id]
+        self.top_seed = self.snake_seeds()[top_id]
+        self.top_fitness = self.fitness[top_id]
 
     def calculate_total_fitness(self):
-        total = 0
-        for snake in self.snakes:
-            total += snake.fitness
-        self.total_fitness = total
+        self.total_fitness = self.fitness.sum()
 
     def natural_selection(self):
         self.calculate_total_fitness()
         self.select_top_snake()
-        new_generation = [self.top_snake.clone()]
+        rng = self.rng(self.BREEDING)
+
+        parents = self.stack
+        with self.timer.phase('saving'):
+            if Const.ARCHIVE:
+                self.writer.submit(self.archive_generation, self.generation_id, parents, self.fitness.copy())
+            if Const.RECORD_GAMES:
+                log = GameLog(self.generation_id, self.snake_seeds(), self.fitness, self.actions, self.lengths)
+                self.writer.submit(self.record_games, log)
+        with self.timer.phase('selection'):
+            first, second = select_parents(self.fitness, self.size - 1, rng=rng)
+            children = parents.crossover(first, second, rng)
+            children.mutate(rng)
+            elite = parents.params[[self.top_id]]
+            self.set_brains(BrainStack.from_params(np.concatenate([elite, children.params]), parents.topology))
+        self.snakes = None
 
-        while len(new_generation) < self.size:
-            parent1 = self.select_snake()
-            parent2 = self.select_snake()
+        metrics = self.generation_metrics()
+        self.generation_id += 1
+        self.snake_in_game_id = 0
+        if self.verbose:
+            print(f'New generation {self.generation_id} of snakes')
+        with self.timer.phase('saving'):
+            self.save()
 
-            child = parent1.crossover(parent2)
-            child.mutate()
+        metrics['wall_s'] = time.perf_counter() - self.generation_start
+        metrics['steps_per_s'] = metrics['steps'] / (self.evaluation_s or metrics['wall_s'])
+        # saves written in the background while this generation ran
+        self.timer.add('persistence', *self.writer.work())
+        self.writer.submit(self.metrics.append, {**metrics, **self.timer.reset()})
+        self.generation_start = time.perf_counter()
+        self.evaluation_s = None
 
-            new_generation.append(child)
+    def generation_metrics(self):
+        """Metrics of the evaluated generation, see MetricsLog.FIELDS"""
+        p10, p50, p90 = np.percentile(self.fitness, [10, 50, 90])
+        lengths = self.scores + len(SnakeEngine.START_TAIL) + 1
+        deaths = np.bincount(self.deaths[self.deaths != SnakeEngine.ALIVE], minlength=len(SnakeEngine.DEATH_CAUSES))
+        return {
+            'generation_id': self.generation_id,
+            'generation_size': self.size,
+            'total_fitness': self.total_fitness,
+            'top_fitness': self.top_fitness,
+            'fitness_p10': p10,
+            'fitness_p50': p50,
+            'fitness_p90': p90,
+            'mean_length': lengths.mean(),
+            'max_length': lengths.max(),
+            'mean_moves': self.moves.mean(),
+            **{f'deaths_{cause}': count for cause, count in zip(SnakeEngine.DEATH_CAUSES, deaths)},
+            'steps': int(self.lengths.sum())
+        }
 
-        self.snakes = new_generation
+    def evaluate(self):
+        """Plays every snake of the generation without rendering"""
+        start = time.perf_counter()
+        if Const.WORKERS > 1:
+            if self.evaluator is None:
+                self.evaluator = ParallelEvaluator(Const.WORKERS)
+            results = self.evaluator.evaluate(self.stack, self.snake_seeds(), self.timer)
+            self.fitness, self.scores, self.moves, self.deaths, self.actions, self.lengths = results
+        elif Const.BATCH_SIMULATION:
+            games = BatchEngine(self.stack, self.snake_seeds(), self.timer)
+            games.play()
+            self.fitness = games.fitness
+            self.scores = games.score
+            self.moves = games.moves_done
+            self.deaths = games.death
+            self.actions, self.lengths = games.log()
+        else:
+            for idx, snake in enumerate(self.games()):
+                self.snake_in_game_id = idx
+                snake.play()
+            self.collect_results()
+        self.evaluation_s = time.perf_counter() - start
 
-        self.generation_id += 1
-        self.snake_in_game_id = 0
-        print(f'New generation {self.generation_id} of snakes')
-        threading.Thread(target=self.save).start()
+    def rng(self, stream):
+        """Generator of one of the random streams of the current generation"""
+        return np.random.default_rng([self.seed, self.generation_id, stream])
+
+    def snake_seeds(self):
+        """Apple seed of every snake of the current generation"""
+        return np.random.SeedSequence([self.seed, self.generation_id, self.APPLES]).generate_state(self.size)
+
+    def flush(self):
+        """Waits until everything queued for saving is on disk"""
+        self.writer.submit(self.storage.sync)
+        self.writer.flush()
+
+    def close(self):
+        if self.evaluator is not None:
+            self.evaluator.close()
+            self.evaluator = None
+        try:
+            self.writer.submit(self.storage.sync)
+        finally:
+            self.writer.close()
+
+    def collect_results(self):
+        """Reads results of the games played by the snakes' own engines"""
+        self.fitness = np.array([snake.fitness for snake in self.snakes], dtype=float)
+        self.scores = np.array([snake.score for snake in self.snakes])
+        self.moves = np.array([snake.moves_done for snake in self.snakes])
+        self.deaths = np.array([snake.death for snake in self.snakes])
+        self.actions = np.frombuffer(b''.join(snake.decisions for snake in self.snakes), dtype=np.uint8)
+        self.lengths = np.array([len(snake.decisions) for snake in self.snakes])
+
+    def run_generation(self):
+        profiler = cProfile.Profile() if Const.CPROFILE else None
+        if profiler is not None:
+            profiler.enable()
+
+        with self.timer.phase('evaluation'):
+            self.evaluate()
+        self.natural_selection()
+
+        if profiler is not None:
+            profiler.disable()
+            profiler.create_stats()
+            self.writer.submit(self.save_profile, self.generation_id - 1, profiler.stats)
+
+    def save_profile(self, generation_id, stats):
+        """Writes cProfile stats of a generation, readable with pstats"""
+        self.storage.atomic_write(self.storage.profile(generation_id), lambda file: marshal.dump(stats, file))
+
+    def top_game(self):
+        """New SnakeEngine replaying the game of the top snake of the last generation"""
+        return SnakeEngine(self.top_brain, rng=np.random.default_rng(self.top_seed))
 
     def get_snake(self):
-        return self.snakes[self.snake_in_game_id]
+        return self.games()[self.snake_in_game_id]
 
     def next_snake(self):
         done = True
-        for snake in self.snakes:
+        for snake in self.games():
             done = done and not snake.alive
 
         if done:
+            self.collect_results()
             self.natural_selection()
         else:
             self.snake_in_game_id += 1
         return self.get_snake()
 
     def save(self):
-        for idx, snake in enumerate(self.snakes):
-            snake.save_to_file(self.generation_id, idx)
-        print(f'Generation {self.generation_id} successfully saved!')
+        """Queues a checkpoint of the current generation, replacing an older one still waiting"""
+        self.writer.submit(self.save_checkpoint, self.stack, self.generation_id, self.seed, key='checkpoint')
+
+    def save_checkpoint(self, brains, generation_id, seed):
+        self.storage.atomic_write(self.storage.checkpoint,
+                                  lambda file: save_generation(file, brains, generation_id, seed))
+        if self.verbose:
+            print(f'Generation {generation_id} successfully saved!')
+
+    def archive_generation(self, generation_id, brains, fitness):
+        self.archive.append(generation_id, brains, fitness)
+        self.storage.touched(self.archive.brains_path, self.archive.fitness_path, self.archive.index_path)
+
+    def record_games(self, log):
+        self.storage.atomic_write(self.storage.replay(log.generation_id), log.save)
+
+    def load_snake(self, snake_id):
+        """Reads a snake saved by older versions, one JSON file per snake"""
+        brain = SnakeBrain()
+        with open(self.storage.legacy_snake(snake_id), 'r') as json_file:
+            try:
+                data = json.load(json_file)
+                brain.load_from_dict(data['brain'])
+                return brain, data['generation_id']
+            except json.JSONDecodeError:
+                return brain, 0
+
+    def load_last_generation(self, interactive=True):
+        self.brains = []
+        self.snakes = None
+        if self.storage.checkpoint.exists():
+            brains, header = load_generation(self.storage.checkpoint)
+            if brains.topology != Topology():
+                print(f'Resuming brains of {brains.topology}, the configured topology applies to new runs only')
+            if header['size'] != self.size:
+                print(f'Resuming a population of {header["size"]} snakes, '
+                      f'the configured size of {self.size} applies to new runs only')
+            self.set_brains(brains)
+            self.size = header['size']
+            self.generation_id = header['generation_id']
+            if header['seed'] is not None:
+                self.seed = header['seed']
+            return
 
-    def load_last_generation(self):
-        self.snakes = []
         try:
             for idx in range(self.size):
-                snake = SmartSnake(self.game)
-                self.generation_id = snake.load_from_file(idx)
-                self.snakes.append(snake)
+                brain, self.generation_id = self.load_snake(idx)
+                self.brains.append(brain)
+            self.set_brains(BrainStack(self.brains))
         except FileNotFoundError:
+            if not interactive:
+                raise Exception('Not full population!')
             answer = input('Can\'t load last generation! Generate snakes randomly? [y/n]')
 
             if answer.lower() == 'y':
-                self.snakes = []
                 self.create_snakes()
             else:
                 raise Exception('Not full population!')
-
-    def save_top_snake(self):
-        try:
-            os.mkdir(os.curdir + '\\data')
-        except FileExistsError:
-            pass
-        try:
-            os.mkdir(os.curdir + f'\\data\\V_{Const.VERSION}')
-        except FileExistsError:
-            pass
-        try:
-            os.mkdir(os.curdir + f'\\data\\V_{Const.VERSION}\\top_snakes')
-        except FileExistsError:
-            pass
-        try:
-            os.mkdir(os.curdir + f'\\data\\V_{Const.VERSION}\\info')
-        except FileExistsError:
-            pass
-        with open(f'data\\V_{Const.VERSION}\\top_snakes\\gen_{self.generation_id}.json', 'w') as json_file:
-            data = {
-                'generation_id': self.generation_id,
-                'generation_size': self.size,
-                'total_fitness': self.total_fitness,
-                'generation_avg_fitness': self.total_fitness / self.size,
-                'snake_fitness': self.top_snake.fitness,
-                'snake_brain': self.top_snake.brain.save_to_dict()
-            }
-            json.dump(data, json_file)
-        with open(f'data\\V_{Const.VERSION}\\info\\progress.csv', 'a') as csv_file:
-            fieldnames = ['generation_id', 'generation_size', 'total_fitness', 'top_fitness']
-            csv_writer = csv.DictWriter(csv_file, fieldnames)
-            new_data = {
-                'generation_id': self.generation_id,
-                'generation_size': self.size,
-                'total_fitness': self.total_fitness,
-                'top_fitness': self.top_snake.fitness
-            }
-            csv_writer.writerow(new_data)
@@ -0,0 +1,79 @@
+"""
+author: edacjos
+created: 10/18/2026
+"""
+
+import time
+from contextlib import nullcontext
+
+
+class Phase:
+    """Adds the time spent in a with block to a phase of a PhaseTimer"""
+
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+        self.start = 0.
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.timer.add(self.name, time.perf_counter() - self.start)
+
+
+class PhaseTimer:
+    """Wall time and number of runs of the phases of a generation.
+
+    Sensing, inference, movement and apples are parts of the evaluation,
+    timed inside the engines. Saving is the time the training loop spends
+    queueing saves, persistence the time the background Writer spends
+    writing them. A disabled timer hands out a shared no-op
+    context, so instrumented code costs next to nothing when profiling is
+    off.
+    """
+
+    PHASES = ('sensing', 'inference', 'movement', 'apples', 'evaluation', 'selection', 'saving', 'persistence')
+    OFF = nullcontext()
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.seconds = dict.fromkeys(self.PHASES, 0.)
+        self.calls = dict.fromkeys(self.PHASES, 0)
+        self.phases = {name: Phase(self, name) for name in self.PHASES}
+
+    def phase(self, name):
+        return self.phases[name] if self.enabled else self.OFF
+
+    def add(self, name, seconds, calls=1):
+        self.seconds[name] += seconds
+        self.calls[name] += calls
+
+    def merge(self, fields):
+        """Adds the phases of another timer, given as its fields()"""
+        for name in self.PHASES:
+            self.add(name, fields[f'{name}_s'], fields[f'{name}_calls'])
+
+    @classmethod
+    def field_names(cls):
+        return [f'{name}_{unit}' for name in cls.PHASES for unit in ('s', 'calls')]
+
+    def fields(self):
+        """Seconds and runs of every phase, named as field_names(), empty if disabled"""
+        if not self.enabled:
+            return {}
+        return {f'{name}_{unit}': values[name]
+                for name in self.PHASES for unit, values in (('s', self.seconds), ('calls', self.calls))}
+
+    def reset(self):
+        """Returns fields() and starts timing from zero"""
+        fields = self.fields()
+        self.seconds = dict.fromkeys(self.PHASES, 0.)
+        self.calls = dict.fromkeys(self.PHASES, 0)
+        return fields
+
+
+# timer of the engines created without one
+NO_TIMER = PhaseTimer()
@@ -1,34 +1,134 @@
 """
 author: edacjos
 created: 7/14/19
+
+Live fitness of one or more training runs, e.g.
+    python progress_monitor.py runs/a runs/b
 """
 
+import argparse
 import matplotlib.pyplot as plt
-import pandas as pd
-from itertools import count
+import numpy as np
 from matplotlib.animation import FuncAnimation
-from support import Const
+from metrics import MetricsReader
+from storage import Storage
+
+
+class Downsampler:
+    """Min, max and mean of a growing series kept in a fixed number of buckets.
+
+    Every bucket covers the same number of points. Once all buckets are
+    full, neighbouring buckets are merged and each covers twice as many, so
+    memory and drawing cost stay the same however long the series grows.
+    """
+
+    def __init__(self, buckets=1000):
+        if buckets < 2:
+            raise ValueError(f'At least 2 buckets are needed, got {buckets}')
+        self.buckets = buckets - buckets % 2
+        self.width = 1
+        self.points = 0
+        self.x = np.zeros(self.buckets)
+        self.total = np.zeros(self.buckets)
+        self.count = np.zeros(self.buckets)
+        self.low = np.full(self.buckets, np.inf)
+        self.high = np.full(self.buckets, -np.inf)
+
+    def __len__(self):
+        return -(-self.points // self.width)
+
+    def extend(self, x, y):
+        while len(x):
+            if self.points == self.buckets * self.width:
+                self.merge()
+            chunk = min(len(x), self.buckets * self.width - self.points)
+            idx = (self.points + np.arange(chunk)) // self.width
+            np.add.at(self.x, idx, x[:chunk])
+            np.add.at(self.total, idx, y[:chunk])
+            np.add.at(self.count, idx, 1)
+            np.minimum.at(self.low, idx, y[:chunk])
+            np.maximum.at(self.high, idx, y[:chunk])
+            self.points += chunk
+            x, y = x[chunk:], y[chunk:]
+
+    def merge(self):
+        """Merges pairs of buckets, freeing the second half of them"""
+        half = self.buckets // 2
+        for values, combine, empty in ((self.x, np.add, 0), (self.total, np.add, 0), (self.count, np.add, 0),
+                                       (self.low, np.minimum, np.inf), (self.high, np.maximum, -np.inf)):
+            values[:half] = combine(values[0::2], values[1::2])
+            values[half:] = empty
+        self.width *= 2
+
+    def series(self):
+        """Mean x, mean, min and max of every used bucket"""
+        used = len(self)
+        count = self.count[:used]
+        return self.x[:used] / count, self.total[:used] / count, self.low[:used], self.high[:used]
+
+
+class RunView:
+    """Lines of a training run, fed only with the metrics appended since the last update"""
+
+    SERIES = {
+        'average': lambda data: data['total_fitness'] / data['generation_size'],
+        'top': lambda data: data['top_fitness']
+    }
+
+    def __init__(self, axes, root, buckets):
+        storage = Storage(root)
+        self.reader = MetricsReader(storage)
+        self.samplers = {name: Downsampler(buckets) for name in self.SERIES}
+        self.lines = {}
+        for name in self.SERIES:
+            mean, = axes.plot([], [], label=f'{storage.root}: {name} fitness')
+            low, = axes.plot([], [], color=mean.get_color(), alpha=.3, linewidth=.5)
+            high, = axes.plot([], [], color=mean.get_color(), alpha=.3, linewidth=.5)
+            self.lines[name] = (mean, low, high)
+
+    def update(self):
+        """Returns whether new metrics arrived"""
+        data = self.reader.read()
+        if not len(data):
+            return False
+        x = data['generation_id'].astype(float)
+        for name, values in self.SERIES.items():
+            sampler = self.samplers[name]
+            sampler.extend(x, values(data).astype(float))
+            x_mean, mean, low, high = sampler.series()
+            for line, y in zip(self.lines[name], (mean, low, high)):
+                line.set_data(x_mean, y)
+        return True
 
 
-def animate(i):
-    names = ['generation_id', 'generation_size', 'total_fitness', 'top_fitness']
-    data = pd.read_csv(f'data\\V_{Const.VERSION}\\info\\progress.csv', names=names)
-    x = data['generation_id']
-    y1 = data['total_fitness'] / data['generation_size']
-    y2 = data['top_fitness']
+def bucket_count(value):
+    buckets = int(value)
+    if buckets < 2:
+        raise argparse.ArgumentTypeError(f'at least 2 buckets are needed, got {buckets}')
+    return buckets
 
-    plt.cla()
 
-    plt.plot(x, y1, label='Average fitness')
-    plt.plot(x, y2, label='Top fitness')
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Watch the fitness of training runs.')
+    parser.add_argument('roots', nargs='*', default=[None], help='checkpoint directories of the runs')
+    parser.add_argument('--buckets', type=bucket_count, default=1000, help='points drawn per line')
+    args = parser.parse_args(argv)
 
-    plt.legend(loc='upper left')
-    plt.tight_layout()
+    figure, axes = plt.subplots()
+    views = [RunView(axes, root, args.buckets) for root in args.roots]
+    axes.legend(loc='upper left')
 
+    def animate(i):
+        if any([view.update() for view in views]):
+            axes.relim()
+            axes.autoscale_view()
 
-index = count()
+    # the animation has to stay referenced while the window is open
+    animation = FuncAnimation(figure, animate, interval=1000, cache_frame_data=False)
+    figure.tight_layout()
+    plt.show()
+    return animation
 
-ani = FuncAnimation(plt.gcf(), animate, interval=1000)
 
-plt.tight_layout()
-plt.show()
+if __name__ == '__main__':
+    main()
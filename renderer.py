@@ -0,0 +1,94 @@
+"""
+author: edacjos
+created: 10/18/2026
+"""
+
+from collections import deque
+from tkinter import NW, HIDDEN, NORMAL
+from game_objects import Sprites
+from support import Const
+
+
+class BoardRenderer:
+    """Draws SnakeEngine games on a canvas with a pool of reused canvas items.
+
+    Items are created once and hidden when not needed, so showing the next
+    snake only moves items of the previous one. A turn moves the head and
+    the end of the tail to the cell the head left, and touches apples only
+    when one is eaten, whatever the length of the snake.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.engine = None
+        self.moves_done = 0
+        self.head_cell = None
+        self.head = self.create('head')
+        # tail items from the end of the tail to the one next to the head
+        self.tail = deque()
+        self.apples = {}
+        self.spare = {'tail': [], 'apple': []}
+
+    def create(self, name):
+        return self.canvas.create_image(0, 0, image=Sprites.get(self.canvas, name), anchor=NW, tag=name,
+                                        state=HIDDEN)
+
+    def place(self, item, cell):
+        self.canvas.coords(item, cell[0] * Const.SQUARE_SIZE, cell[1] * Const.SQUARE_SIZE)
+
+    def acquire(self, name, cell):
+        """Shows a spare item, or a new one, on a cell"""
+        item = self.spare[name].pop() if self.spare[name] else self.create(name)
+        self.place(item, cell)
+        self.canvas.itemconfigure(item, state=NORMAL)
+        return item
+
+    def release(self, name, item):
+        self.canvas.itemconfigure(item, state=HIDDEN)
+        self.spare[name].append(item)
+
+    def show(self, engine):
+        """Draws a game from scratch, reusing the items of the one shown before"""
+        self.engine = engine
+        self.redraw()
+
+    def redraw(self):
+        tail = self.engine.tail
+        while len(self.tail) > len(tail):
+            self.release('tail', self.tail.pop())
+        while len(self.tail) < len(tail):
+            self.tail.append(self.acquire('tail', tail[len(self.tail)]))
+        for item, cell in zip(self.tail, tail):
+            self.place(item, cell)
+
+        self.head_cell = self.engine.head
+        self.place(self.head, self.head_cell)
+        self.canvas.itemconfigure(self.head, state=NORMAL)
+        self.moves_done = self.engine.moves_done
+        self.update_apples()
+
+    def update(self):
+        """Draws the turns made by the game since the last update"""
+        if self.engine.moves_done != self.moves_done + 1:
+            if self.engine.moves_done != self.moves_done:
+                self.redraw()
+            return
+
+        if len(self.tail) < len(self.engine.body):
+            self.tail.append(self.acquire('tail', self.head_cell))
+        else:
+            end = self.tail.popleft()
+            self.place(end, self.head_cell)
+            self.tail.append(end)
+
+        self.head_cell = self.engine.head
+        self.place(self.head, self.head_cell)
+        self.moves_done = self.engine.moves_done
+        self.update_apples()
+
+    def update_apples(self):
+        for cell in [cell for cell in self.apples if cell not in self.engine.apples]:
+            self.release('apple', self.apples.pop(cell))
+        for cell in self.engine.apples:
+            if cell not in self.apples:
+                self.apples[cell] = self.acquire('apple', cell)
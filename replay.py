@@ -0,0 +1,91 @@
+"""
+author: edacjos
+created: 10/18/2026
+
+Replays a game recorded during training, e.g.
+    python replay.py --generation 120                  top snake of generation 120
+    python replay.py --snake 7 --export snake_7.json   snake 7 of the last generation, as JSON
+"""
+
+import argparse
+import json
+import tkinter as tk
+import numpy as np
+from boards import GameBoard
+from engine import SnakeEngine
+from game_log import GameLog
+from renderer import BoardRenderer
+from storage import Storage
+from support import Const
+
+
+def replay(actions, seed):
+    """Yields the SnakeEngine of a recorded game before the first and after every step"""
+    engine = SnakeEngine(rng=np.random.default_rng(seed))
+    yield engine
+    for decision in actions:
+        engine.step(int(decision))
+        if not engine.alive:
+            return
+        yield engine
+
+
+def export(actions, seed, path, **info):
+    """Writes every frame of a recorded game as JSON, with any extra info given"""
+    frames = [{'head': engine.head, 'tail': engine.tail, 'apples': engine.apples, 'score': engine.score}
+              for engine in replay(actions, seed)]
+    with open(path, 'w') as json_file:
+        json.dump({**info, 'seed': seed, 'frames': frames}, json_file)
+
+
+def watch(actions, seed, delay=Const.AI_DELAY):
+    """Shows a recorded game on a GameBoard"""
+    root = tk.Tk()
+    root.title('Snake Replay')
+    board = GameBoard()
+    board.grid(column=0, row=0)
+    renderer = BoardRenderer(board)
+    frames = replay(actions, seed)
+    renderer.show(next(frames))
+
+    def on_timer():
+        if next(frames, None) is not None:
+            renderer.update()
+            root.after(delay, on_timer)
+
+    root.after(delay, on_timer)
+    root.mainloop()
+
+
+def last_generation(storage):
+    generation_ids = [int(path.stem.split('_')[-1]) for path in storage.replays.glob('generation_*.npz')]
+    if not generation_ids:
+        raise FileNotFoundError(f'No recorded games in {storage.replays}')
+    return max(generation_ids)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay a recorded game without its brain.')
+    parser.add_argument('--checkpoint-dir', help='root directory of checkpoints and logs')
+    parser.add_argument('--generation', type=int, help='last recorded generation if omitted')
+    parser.add_argument('--snake', type=int, help='fittest snake of the generation if omitted')
+    parser.add_argument('--export', help='write the frames to this JSON file instead of showing them')
+    parser.add_argument('--delay', type=int, default=Const.AI_DELAY, help='ms between two frames')
+    args = parser.parse_args(argv)
+
+    storage = Storage(args.checkpoint_dir)
+    generation_id = args.generation if args.generation is not None else last_generation(storage)
+    log = GameLog.load(storage.replay(generation_id))
+    snake_id = args.snake if args.snake is not None else log.top_id
+    actions, seed = log.game(snake_id)
+    print(f'Generation {generation_id}, snake {snake_id}: fitness {log.fitness[snake_id]:.0f}, {len(actions)} steps')
+
+    if args.export:
+        export(actions, seed, args.export, generation_id=generation_id, snake_id=snake_id,
+               fitness=float(log.fitness[snake_id]))
+    else:
+        watch(actions, seed, args.delay)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+author: edacjos
+created: 10/18/2026
+"""
+
+import numpy as np
+from support import Const
+
+
+class Selection:
+    """Picks parents of the next generation from the fitness of the current one"""
+
+    def __init__(self, fitness, rng=None):
+        self.fitness = np.asarray(fitness, dtype=float)
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def select(self, count):
+        """Indices of count parents"""
+        raise NotImplementedError
+
+
+class ProportionalSelection(Selection):
+    """Roulette wheel: probability of a pick proportional to fitness"""
+
+    def __init__(self, fitness, rng=None):
+        super().__init__(fitness, rng)
+        self.cum_sum = np.cumsum(self.fitness)
+        self.total = self.cum_sum[-1]
+
+    def select(self, count):
+        if self.total <= 0:
+            return self.rng.integers(0, len(self.fitness), count)
+        picks = self.rng.random(count) * self.total
+        return np.minimum(np.searchsorted(self.cum_sum, picks), len(self.fitness) - 1)
+
+
+class RankSelection(ProportionalSelection):
+    """Roulette wheel over ranks, the best snake weighs as much as the population size"""
+
+    def __init__(self, fitness, rng=None):
+        ranks = np.empty(len(fitness))
+        ranks[np.argsort(fitness, kind='stable')] = np.arange(1, len(fitness) + 1)
+        super().__init__(ranks, rng)
+
+
+class StochasticUniversalSelection(ProportionalSelection):
+    """Evenly spaced pointers on the roulette wheel, picks in random order"""
+
+    def select(self, count):
+        if self.total <= 0:
+            return self.rng.integers(0, len(self.fitness), count)
+        picks = (self.rng.random() + np.arange(count)) * self.total / count
+        parents = np.minimum(np.searchsorted(self.cum_sum, picks), len(self.fitness) - 1)
+        self.rng.shuffle(parents)
+        return parents
+
+
+class TournamentSelection(Selection):
+    """Fittest of Const.TOURNAMENT_SIZE random snakes"""
+
+    def select(self, count):
+        candidates = self.rng.integers(0, len(self.fitness), (count, Const.TOURNAMENT_SIZE))
+        return candidates[np.arange(count), np.argmax(self.fitness[candidates], axis=1)]
+
+
+SELECTIONS = {
+    'proportional': ProportionalSelection,
+    'rank': RankSelection,
+    'sus': StochasticUniversalSelection,
+    'tournament': TournamentSelection
+}
+
+
+def select_parents(fitness, count, method=None, rng=None):
+    """Two arrays of count parents, using Const.SELECTION unless method is given"""
+    selection = SELECTIONS[method or Const.SELECTION](fitness, rng)
+    parents = selection.select(2 * count)
+    return parents[:count], parents[count:]
@@ -0,0 +1,132 @@
+"""
+author: edacjos
+created: 10/18/2026
+"""
+
+import numpy as np
+from support import Const, Direction
+
+
+class Sensor:
+    """Ray tables of the board used to build the brain inputs.
+
+    For every cell and each of Const.DIRECTIONS, `cells` lists the cells a
+    snake sees from there, padded with an extra cell standing for everything
+    outside of the board. Looking is a gather from an occupancy grid along
+    these precomputed rays instead of a walk square by square.
+
+    The wall input of a ray is 1 / (cells to the wall + 1), the inverse of
+    the steps needed to leave the board: 1 for a head on the edge. Before
+    the headless engine it was 1 / (cells to the wall), which divided by
+    zero on the edge, so brains saved by those versions (legacy JSON
+    snakes) see wall inputs shifted by one cell.
+    """
+
+    EMPTY = 0
+    HEAD = 1
+    TAIL = 2
+    APPLE = 3
+    WALL = 4
+
+    # directions in which the distance to the wall is an input
+    WALL_DIRECTIONS = [Direction.NORTH, Direction.WEST]
+
+    def __init__(self, size=Const.NUM_OF_SQUARES):
+        self.size = size
+        self.wall_cell = size * size
+
+        x, y = np.meshgrid(np.arange(size), np.arange(size))
+        x, y = x.ravel(), y.ravel()
+        steps = np.arange(1, size + 1)
+        self.cells = np.full((size * size, len(Const.DIRECTIONS), size), self.wall_cell, dtype=np.intp)
+        self.wall = np.zeros((size * size, len(Const.DIRECTIONS)))
+
+        for ray, direction in enumerate(Const.DIRECTIONS):
+            xs = x[:, None] + direction.move_x * steps
+            ys = y[:, None] + direction.move_y * steps
+            inside = (xs >= 0) & (xs < size) & (ys >= 0) & (ys < size)
+            self.cells[:, ray] = np.where(inside, ys * size + xs, self.wall_cell)
+            self.wall[:, ray] = 1 / (inside.sum(axis=1) + 1)
+
+        self.distance = 1 / steps
+
+        self.apple_slots, self.tail_slots, self.wall_slots, self.wall_rays = [], [], [], []
+        slot = 0
+        for ray, direction in enumerate(Const.DIRECTIONS):
+            self.apple_slots.append(slot)
+            self.tail_slots.append(slot + 1)
+            slot += 2
+            if direction in self.WALL_DIRECTIONS:
+                self.wall_slots.append(slot)
+                self.wall_rays.append(ray)
+                slot += 1
+        self.inputs = slot
+        self.apple_slots, self.tail_slots, self.wall_slots, self.wall_rays = (
+            np.array(slots, dtype=np.intp) for slots in (self.apple_slots, self.tail_slots, self.wall_slots,
+                                                         self.wall_rays))
+
+        # buffers of look(), which allocates no array per step
+        rays = len(Const.DIRECTIONS)
+        self.view = np.empty((rays, size), dtype=np.int8)
+        self.masks = np.empty((2, rays, size), dtype=bool)
+        self.at = np.empty((2, rays), dtype=np.intp)
+        self.found = np.empty((2, rays), dtype=bool)
+        self.seen = np.empty(rays)
+        self.blind = np.empty(rays, dtype=bool)
+        self.walls = np.empty(len(self.wall_rays))
+        self.sight = np.empty(len(self.wall_rays), dtype=bool)
+        self.buffer = np.empty(self.inputs)
+
+    def cell_index(self, x, y):
+        return y * self.size + x
+
+    def new_grid(self):
+        """Empty occupancy grid, one value per cell plus the wall"""
+        grid = np.full(self.size * self.size + 1, self.EMPTY, dtype=np.int8)
+        grid[self.wall_cell] = self.WALL
+        return grid
+
+    def look(self, grid, head):
+        """Brain inputs of a snake whose head is in cell head of the occupancy grid.
+
+        Same values as encode() for one snake, written to a buffer the next look overwrites.
+        """
+        np.take(grid, self.cells[head], out=self.view)
+        apples, tails = self.masks
+        np.equal(self.view, self.APPLE, out=apples)
+        np.equal(self.view, self.TAIL, out=tails)
+        self.masks.argmax(axis=-1, out=self.at)
+        self.masks.any(axis=-1, out=self.found)
+
+        inputs = self.buffer
+        for at, found, slots in zip(self.at, self.found, (self.apple_slots, self.tail_slots)):
+            np.take(self.distance, at, out=self.seen)
+            self.seen *= found
+            inputs[slots] = self.seen
+        # a ray stops before the wall once it has found both an apple and the tail
+        np.logical_and(self.found[0], self.found[1], out=self.blind)
+        np.take(self.blind, self.wall_rays, out=self.sight)
+        np.logical_not(self.sight, out=self.sight)
+        np.take(self.wall[head], self.wall_rays, out=self.walls)
+        self.walls *= self.sight
+        inputs[self.wall_slots] = self.walls
+        return inputs
+
+    def encode(self, heads, apples, tails):
+        """Brain inputs from apple and tail masks along the rays of heads.
+
+        Masks are shaped (..., rays, size) with any leading dimensions, so the
+        same encoding serves one snake or a whole batch.
+        """
+        apple_at = apples.argmax(axis=-1)
+        tail_at = tails.argmax(axis=-1)
+        apple_found = np.take_along_axis(apples, apple_at[..., None], axis=-1)[..., 0]
+        tail_found = np.take_along_axis(tails, tail_at[..., None], axis=-1)[..., 0]
+
+        inputs = np.empty(apple_at.shape[:-1] + (self.inputs,))
+        inputs[..., self.apple_slots] = self.distance[apple_at] * apple_found
+        inputs[..., self.tail_slots] = self.distance[tail_at] * tail_found
+        # a ray stops before the wall once it has found both an apple and the tail
+        blind = (apple_found & tail_found)[..., self.wall_rays]
+        inputs[..., self.wall_slots] = self.wall[heads][..., self.wall_rays] * ~blind
+        return inputs
@@ -5,171 +5,10 @@ last modified: 07/13/2019
 """
 
 
-import json
-import random
-import os
-import numpy as np
-from support import Const, Position, Direction, Move
+from support import Const, Position, Direction
 from game_objects import SnakeHead, SnakeTail
 
 
-class SnakeBrain:
-    VERSION = Const.VERSION
-    INPUTS = 18
-    N_FIRST_HIDDEN = 12
-    N_SECOND_HIDDEN = 12
-    OUTPUTS = 4
-
-    @staticmethod
-    def activation(x):
-        return 1 / (1 + np.exp(-x))
-
-    def __init__(self):
-        self.w_i = np.random.standard_normal((self.N_FIRST_HIDDEN, self.INPUTS))
-        self.w_h = np.random.standard_normal((self.N_SECOND_HIDDEN, self.N_FIRST_HIDDEN))
-        self.w_o = np.random.standard_normal((self.OUTPUTS,  self.N_SECOND_HIDDEN))
-        self.b_i = np.random.standard_normal((self.N_FIRST_HIDDEN,))
-        self.b_h = np.random.standard_normal((self.N_SECOND_HIDDEN,))
-        self.b_o = np.random.standard_normal((self.OUTPUTS,))
-
-    def analyze(self, input_data):
-        input_activation = np.matmul(self.w_i, input_data)
-        input_activation = input_activation + self.b_i
-        input_activation = self.activation(input_activation)
-
-        hidden_activation = np.matmul(self.w_h, input_activation)
-        hidden_activation = hidden_activation + self.b_h
-        hidden_activation = self.activation(hidden_activation)
-
-        output_activation = np.matmul(self.w_o, hidden_activation)
-        output_activation = output_activation + self.b_o
-        output_activation = self.activation(output_activation)
-
-        return output_activation
-
-    def mutate(self):
-        def weights_mutate(weights):
-            for i in range(weights.shape[0]):
-                for j in range(weights.shape[1]):
-                    if random.random() <= Const.MUTATION_RATE:
-                        mutate_factor = np.random.normal(Const.MU, Const.SIGMA)
-                        weights[i][j] += mutate_factor / 5
-
-            return weights
-
-        def bias_mutate(bias):
-            for i in range(bias.shape[0]):
-                if random.random() <= Const.MUTATION_RATE:
-                    mutate_factor = np.random.normal(Const.MU, Const.SIGMA)
-                    bias[i] += mutate_factor / 5
-            return bias
-
-        self.w_i = weights_mutate(self.w_i)
-        self.w_h = weights_mutate(self.w_h)
-        self.w_o = weights_mutate(self.w_o)
-        self.b_i = bias_mutate(self.b_i)
-        self.b_h = bias_mutate(self.b_h)
-        self.b_o = bias_mutate(self.b_o)
-
-    def clone(self):
-        clone = SnakeBrain()
-        clone.w_i = self.w_i
-        clone.w_h = self.w_h
-        clone.w_o = self.w_o
-        clone.b_i = self.b_i
-        clone.b_h = self.b_h
-        clone.b_o = self.b_o
-
-        return clone
-
-    def crossover(self, other):
-        def crop_w_crossover(weights, other_w):
-            child_w = np.random.random(weights.shape)
-
-            start_row = random.randrange(0, child_w.shape[0])
-            end_row = random.randrange(start_row, child_w.shape[0])
-            start_col = random.randrange(0, child_w.shape[1])
-            end_col = random.randint(start_col, child_w.shape[1])
-
-            for i in range(child_w.shape[0]):
-                for j in range(child_w.shape[1]):
-                    if (
-                            (i == start_row and j >= start_col)
-                            or start_row < i < end_row
-                            or (i == end_row and j <= end_col)
-                    ):
-                        child_w[i][j] = weights[i][j]
-                    else:
-                        child_w[i][j] = other_w[i][j]
-
-            return child_w
-
-        def crop_b_crossover(bias, other_b):
-            child_b = np.random.standard_normal(bias.shape)
-
-            start = random.randrange(0, child_b.shape[0])
-            stop = random.randrange(start, child_b.shape[0])
-
-            for i in range(child_b.shape[0]):
-                if stop >= i >= start:
-                    child_b[i] = bias[i]
-                else:
-                    child_b[i] = other_b[i]
-
-            return child_b
-
-        child = SnakeBrain()
-
-        child.w_i = crop_w_crossover(self.w_i, other.w_i)
-        child.w_h = crop_w_crossover(self.w_h, other.w_h)
-        child.w_o = crop_w_crossover(self.w_o, other.w_o)
-        child.b_i = crop_b_crossover(self.b_i, other.b_i)
-        child.b_h = crop_b_crossover(self.b_h, other.b_h)
-        child.b_o = crop_b_crossover(self.b_o, other.b_o)
-
-        return child
-
-    def save_to_dict(self):
-        def w_to_arr(weights):
-            array = []
-            for i in range(weights.shape[0]):
-                row = []
-                for j in range(weights.shape[1]):
-                    row.append(weights[i][j])
-                array.append(row)
-            return array
-
-        def b_to_arr(bias):
-            array = []
-            for i in range(bias.shape[0]):
-                array.append(bias[i])
-            return array
-
-        result = {
-            'version': self.VERSION,
-            'weights_input_shape': self.w_i.shape,
-            'weights_hidden_shape': self.w_h.shape,
-            'weights_output_shape': self.w_o.shape,
-            'weights_input': w_to_arr(self.w_i),
-            'weights_hidden': w_to_arr(self.w_h),
-            'weights_output': w_to_arr(self.w_o),
-            'bias_input': b_to_arr(self.b_i),
-            'bias_hidden': b_to_arr(self.b_h),
-            'bias_output': b_to_arr(self.b_o)
-        }
-        return result
-
-    def load_from_dict(self, dictionary):
-        if int(dictionary['version']) != int(self.VERSION):
-            raise ValueError('Inconsistent versions!')
-        self.w_i = np.array(dictionary['weights_input'])
-        self.w_h = np.array(dictionary['weights_hidden'])
-        self.w_o = np.array(dictionary['weights_output'])
-        self.b_i = np.array(dictionary['bias_input'])
-        self.b_h = np.array(dictionary['bias_hidden'])
-        self.b_o = np.array(dictionary['bias_output'])
-
-
 class Snake:
 
     def __init__(self, game):
@@ -183,9 +22,23 @@ class Snake:
         ]
         self.direction = Direction.WEST
         self.move = self.direction * Const.SQUARE_SIZE
+        # position the end of the tail left during the last turn
+        self.vacated = None
 
         self.alive = True
 
+    @staticmethod
+    def cell_position(x, y):
+        return Position(x, y) * Const.SQUARE_SIZE
+
+    @staticmethod
+    def cell_index(position):
+        return position.y // Const.SQUARE_SIZE * Const.NUM_OF_SQUARES + position.x // Const.SQUARE_SIZE
+
+    def cells(self):
+        """Indices of the cells taken by the snake"""
+        return [self.cell_index(part.position) for part in [self.head, *self.tail]]
+
     def draw(self, canvas):
         if self.canvas is None:
             self.canvas = canvas
@@ -198,28 +51,28 @@ class Snake:
         self.game.game_over()
 
     def grow(self):
-        tail = SnakeTail(self.tail[-1].position)
+        """Puts a new end of the tail back on the cell the end left during this turn"""
+        tail = SnakeTail(self.vacated)
         tail.draw(self.canvas)
-        self.tail.append(tail)
+        self.tail.insert(0, tail)
+        self.game.free_cells.take(self.cell_index(self.vacated))
 
     def make_turn(self):
         self.check_collisions()
 
         if self.alive:
-            for idx in range(len(self.tail)):
-                c1 = self.tail[idx].position
-
-                try:
-                    c2 = self.tail[idx + 1].position
-                except IndexError:
-                    c2 = self.head.position
-
-                move = c2 - c1
-                self.tail[idx].move(move)
+            # the end of the tail jumps next to the head, the rest stays in place
+            end = self.tail.pop(0)
+            self.vacated = end.position
+            end.move(self.head.position - end.position)
+            self.tail.append(end)
 
             self.move = self.direction * Const.SQUARE_SIZE
             self.head.move(self.move)
 
+            self.game.free_cells.free(self.cell_index(self.vacated))
+            self.game.free_cells.take(self.cell_index(self.head.position))
+
         self.check_apple_collision()
 
     def check_apple_collision(self):
@@ -274,145 +127,36 @@ class Snake:
 
 
 class SmartSnake(Snake):
+    """Plays a SnakeEngine game, drawn by the game's BoardRenderer"""
 
-    def __init__(self, game):
+    def __init__(self, game, engine):
         super().__init__(game)
-        self.brain = SnakeBrain()
-        self.moves_done = 0
-        self.fitness = 0
-        self.left_to_live = 150
-
-    def calc_score(self):
-        self.fitness = int(self.moves_done**2 * pow(2, len(self.tail)))
-
-    def make_decision(self, input_data):
-        output = self.brain.analyze(input_data)
-
-        d_idx = 0
-        decision = output[d_idx]
-
-        for idx, out in enumerate(output):
-            if out > decision:
-                decision = out
-                d_idx = idx
-
-        return Const.DIRECTION_KEYS[d_idx]
-
-    def look(self):
-        data = None
-
-        for direction in Const.DIRECTIONS:
-            if data is None:
-                data = self.look_in_direction(direction)
-            else:
-                if direction not in [Direction.WEST, Direction.NORTH]:
-                    data = np.append(data, self.look_in_direction(direction)[:2])
-                else:
-                    data = np.append(data, self.look_in_direction(direction))
-
-        return np.array([data]).reshape((self.brain.INPUTS, ))
-
-    def look_in_direction(self, direction):
-        data = np.zeros((3, ))
-        position = Position(self.head_x, self.head_y)
-
-        distance = 0
-        tail_found = False
-        apple_found = False
-
-        while 0 < position.x < Const.G_B_W and 0 < position.y < Const.G_B_H:
-            distance += 1
-            position = position + Move(Const.SQUARE_SIZE, Const.SQUARE_SIZE) * direction
-            item = self.canvas.find_in_position(position + Const.SQUARE_SIZE // 2)
-            if len(item) > 0:
-                item_tag = self.canvas.gettags(item)
-                if not apple_found and 'apple' in item_tag:
-                    apple_found = True
-                    data[0] = 1 / distance
-                elif not tail_found and 'tail' in item_tag:
-                    tail_found = True
-                    data[1] = 1 / distance
-
-            if tail_found and apple_found:
-                break
+        self.engine = engine
 
-        else:
-            data[2] = 1 / distance
+    @property
+    def brain(self):
+        return self.engine.brain
 
-        return data
+    @property
+    def fitness(self):
+        return self.engine.fitness
 
-    def grow(self):
-        self.left_to_live += 60
-        tail = SnakeTail(self.tail[-1].position)
-        tail.draw(self.canvas)
-        self.tail.append(tail)
+    def draw(self, canvas):
+        self.canvas = canvas
+        self.game.renderer.show(self.engine)
+
+    def make_turn(self, steps=1):
+        """Makes up to steps turns of the engine and draws only the last one"""
+        score = self.engine.score
+        for _ in range(steps):
+            self.engine.step()
+            if not self.engine.alive:
+                break
 
-    def make_turn(self):
-        self.left_to_live -= 1
-        if self.left_to_live < 0:
+        for _ in range(self.engine.score - score):
+            self.game.update_score()
+        if not self.engine.alive:
             self.die()
+            return
 
-        self.check_collisions()
-
-        if self.alive:
-            self.moves_done += 1
-            data = self.look()
-            decision = self.make_decision(data)
-            self.change_direction(decision)
-
-            for idx in range(len(self.tail)):
-                c1 = self.tail[idx].position
-
-                try:
-                    c2 = self.tail[idx + 1].position
-                except IndexError:
-                    c2 = self.head.position
-
-                move = c2 - c1
-                self.tail[idx].move(move)
-
-            self.move = self.direction * Const.SQUARE_SIZE
-            self.head.move(self.move)
-
-            self.check_apple_collision()
-
-        self.calc_score()
-
-    def clone(self):
-        clone = SmartSnake(self.game)
-        clone.brain = self.brain.clone()
-        return clone
-
-    def mutate(self):
-        self.brain.mutate()
-
-    def crossover(self, other):
-        child = SmartSnake(self.game)
-        child.brain = self.brain.crossover(other.brain)
-        return child
-
-    def save_to_file(self, generation_id, snake_id):
-        try:
-            os.mkdir(os.curdir + '\\data')
-        except FileExistsError:
-            pass
-        try:
-            os.mkdir(os.curdir + f'\\data\\V_{Const.VERSION}')
-        except FileExistsError:
-            pass
-        with open(f'data\\V_{Const.VERSION}\\snake_{snake_id}.json', 'w') as json_file:
-            data = {
-                'generation_id': generation_id,
-                'snake_id': snake_id,
-                'brain': self.brain.save_to_dict()
-            }
-            json.dump(data, json_file)
-
-    def load_from_file(self, snake_id):
-        with open(f'data\\V_{Const.VERSION}\\snake_{snake_id}.json', 'r') as json_file:
-            try:
-                data = json.load(json_file)
-                self.brain.load_from_dict(data['brain'])
-                return data['generation_id']
-            except json.JSONDecodeError:
-                return 0
+        self.game.renderer.update()
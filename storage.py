@@ -0,0 +1,116 @@
+"""
+author: edacjos
+created: 10/18/2026
+"""
+
+import os
+import time
+from pathlib import Path
+from support import Const
+
+
+class Storage:
+    """Files of a training run, kept under a configurable root directory.
+
+    Whole files are committed atomically: written to a temporary file,
+    synced and renamed over the old one, so readers never see a torn file.
+    Syncing directories and appended files is batched, every
+    Const.FSYNC_BATCH commits or on sync().
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root if root is not None else Const.DATA_DIR) / f'V_{Const.VERSION}'
+        self.dirty = set()
+        self.commits = 0
+
+    @property
+    def checkpoint(self):
+        return self.root / 'generation.npz'
+
+    @property
+    def archive(self):
+        return self.root / 'archive'
+
+    @property
+    def metrics(self):
+        return self.root / 'info' / 'metrics.bin'
+
+    @property
+    def metrics_header(self):
+        return self.root / 'info' / 'metrics.json'
+
+    @property
+    def replays(self):
+        return self.root / 'replays'
+
+    def profile(self, generation_id):
+        """cProfile stats of a generation"""
+        return self.root / 'info' / f'profile_{generation_id}.prof'
+
+    def replay(self, generation_id):
+        """GameLog of a generation"""
+        return self.replays / f'generation_{generation_id}.npz'
+
+    def legacy_snake(self, snake_id):
+        """Snake file written by versions saving one JSON file per snake"""
+        return self.root / f'snake_{snake_id}.json'
+
+    def retire(self):
+        """Moves the checkpoint, archive, logs and replays of the run in root to previous/<time>.
+
+        Returns the directory they were moved to, None if there was nothing to move.
+        """
+        info = self.metrics.parent
+        paths = [path for path in (self.checkpoint, self.archive, self.replays) if path.exists()]
+        paths += sorted(info.iterdir()) if info.exists() else []
+        if not paths:
+            return None
+        target = self.root / 'previous' / time.strftime('%Y%m%d_%H%M%S')
+        while target.exists():
+            target = target.with_name(target.name + '_')
+        for path in paths:
+            moved = target / path.relative_to(self.root)
+            moved.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(path, moved)
+        self.touched(self.root, info, target)
+        return target
+
+    def atomic_write(self, path, write):
+        """Commits the file written by write(file) to path in one step"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(path.name + '.tmp')
+        with open(temporary, 'wb') as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+        self.touched(path.parent)
+
+    def append(self, path, data):
+        """Appends text or bytes to a file"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'ab') if isinstance(data, bytes) else open(path, 'a', newline='') as file:
+            file.write(data)
+        self.touched(path)
+
+    def touched(self, *paths):
+        """Marks files or directories as changed, syncing them once enough commits piled up"""
+        self.dirty.update(paths)
+        self.commits += 1
+        if self.commits >= Const.FSYNC_BATCH:
+            self.sync()
+
+    def sync(self):
+        for path in self.dirty:
+            try:
+                descriptor = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue  # directories can't be opened on Windows
+            try:
+                os.fsync(descriptor)
+            except OSError:
+                pass
+            finally:
+                os.close(descriptor)
+        self.dirty.clear()
+        self.commits = 0
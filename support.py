@@ -43,6 +43,8 @@ class Const:
     AI_DELAY = 64
     MIN_AI_DELAY = 1
     MAX_AI_DELAY = 256
+    MAX_DRAW_EVERY = 1024  # Most steps simulated between two frames in watch mode
+    WATCH_MIN_SCORE = 10  # Top score of a generation worth watching in threshold watch mode
     SQUARE_SIZE = 15
     NUM_OF_SQUARES = 40
 
@@ -77,7 +79,22 @@ class Const:
             ]
 
     POPULATION_SIZE = 1000
+    BATCH_SIMULATION = True  # Play whole generations in lockstep with BatchEngine
+    WORKERS = 1  # Processes evaluating a generation, more than one uses ParallelEvaluator
+    SEED = None  # Seed of the apples of a run, random if None
+    ARCHIVE = True  # Keep brains and fitness of every generation in a GenerationArchive
+    RECORD_GAMES = True  # Keep a GameLog of the games of every generation, see replay.py
+    PROFILE = False  # Time the phases of every generation into the progress log
+    CPROFILE = False  # Run every headless generation under cProfile, stats saved next to the progress log
+    DATA_DIR = 'data'  # Root directory of checkpoints, archives and progress logs
+    FSYNC_BATCH = 16  # Commits between syncs of appended files and directories
+    MAX_PENDING_SAVES = 8  # Saves waiting for the background Writer before training waits for the disk
     MUTATION_RATE = .01
+    HIDDEN_LAYERS = (12, 12)  # Sizes of the hidden layers of new brains, between 18 inputs and 4 outputs
+    ACTIVATIONS = 'sigmoid'  # sigmoid, tanh or relu for all layers, or a sequence with one per layer
+    FUSED_ACTIVATIONS = False  # Compute activations in place, sigmoid through tanh so it never overflows
+    SELECTION = 'proportional'  # Parents selection: proportional, rank, sus or tournament
+    TOURNAMENT_SIZE = 5
     MU, SIGMA = 0., 1.
     VERSION = 1.0
 
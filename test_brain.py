@@ -0,0 +1,119 @@
+"""
+author: edacjos
+created: 10/18/2026
+
+Genetic operators of brain.py against the per-element operators they replaced, and copy-on-write, run with
+    python -m pytest test_brain.py
+"""
+
+import itertools
+from types import SimpleNamespace
+import numpy as np
+from brain import BrainStack, SnakeBrain, Topology, layout
+from support import Const
+
+
+SHAPE = (4, 5)
+
+
+def old_rule(shape, start_row, end_row, start_col, end_col):
+    """Cells a child took from its first parent in the original per-element crop crossover"""
+    rows, cols = shape
+    return np.array([[(i == start_row and j >= start_col) or start_row < i < end_row or (i == end_row and j <= end_col)
+                      for j in range(cols)] for i in range(rows)])
+
+
+def all_bounds(shape):
+    """Every (start_row, end_row, start_col, end_col) the original crossover could draw, and its probability"""
+    rows, cols = shape
+    for start_row, start_col in itertools.product(range(rows), range(cols)):
+        for end_row, end_col in itertools.product(range(start_row, rows), range(start_col, cols + 1)):
+            probability = 1 / (rows * (rows - start_row) * cols * (cols + 1 - start_col))
+            yield (start_row, end_row, start_col, end_col), probability
+
+
+def single_matrix(shape):
+    """Stand-in for a Topology with a single parameter"""
+    slices, size = layout({'w': shape})
+    return SimpleNamespace(shapes={'w': shape}, slices=slices, size=size)
+
+
+class ScriptedRng:
+    """Returns the given arrays from integers(), in order, whatever the bounds asked for"""
+
+    def __init__(self, *draws):
+        self.draws = list(draws)
+
+    def integers(self, *args, **kwargs):
+        return np.asarray(self.draws.pop(0))
+
+
+class RecordingRng:
+    """Generator remembering everything drawn with integers()"""
+
+    def __init__(self, seed):
+        self.rng = np.random.default_rng(seed)
+        self.draws = []
+
+    def integers(self, *args, **kwargs):
+        draw = self.rng.integers(*args, **kwargs)
+        self.draws.append(draw)
+        return draw
+
+
+def test_crossover_mask_matches_old_rule_for_every_bound():
+    bounds = np.array([bound for bound, _ in all_bounds(SHAPE)])
+    start_row, end_row, start_col, end_col = bounds.T
+    rng = ScriptedRng(start_row, end_row, start_col, end_col)
+    mask = SnakeBrain.crossover_mask(single_matrix(SHAPE), len(bounds), rng)
+    for row, bound in zip(mask, bounds):
+        assert np.array_equal(row.reshape(SHAPE), old_rule(SHAPE, *bound)), bound
+
+
+def test_crossover_mask_matches_old_rule_for_seeded_bounds():
+    topology = Topology.legacy()
+    rng = RecordingRng(7)
+    mask = SnakeBrain.crossover_mask(topology, 500, rng)
+    draws = iter(rng.draws)
+    for name, shape in topology.shapes.items():
+        cropped = mask[:, topology.slices[name]]
+        if len(shape) == 2:
+            bounds = zip(*[next(draws) for _ in range(4)])
+            expected = [old_rule(shape, *bound).ravel() for bound in bounds]
+        else:
+            bounds = zip(*[next(draws) for _ in range(2)])
+            expected = [(start <= np.arange(shape[0])) & (np.arange(shape[0]) <= stop) for start, stop in bounds]
+        assert np.array_equal(cropped, expected), name
+
+
+def test_crossover_mask_cell_frequencies():
+    expected = sum(probability * old_rule(SHAPE, *bound) for bound, probability in all_bounds(SHAPE))
+    count = 200000
+    mask = SnakeBrain.crossover_mask(single_matrix(SHAPE), count, np.random.default_rng(3))
+    frequency = mask.mean(axis=0).reshape(SHAPE)
+    assert np.all(np.abs(frequency - expected) < 5 * np.sqrt(expected * (1 - expected) / count) + 1e-9)
+
+
+def test_mutation_rate_and_noise_scale():
+    count = 2000000
+    values = np.zeros(count)
+    SnakeBrain.mutation(values, np.random.default_rng(11))
+    mutated = values[values != 0]
+
+    rate = Const.MUTATION_RATE
+    assert abs(len(mutated) / count - rate) < 5 * np.sqrt(rate * (1 - rate) / count)
+    scale = Const.SIGMA / 5
+    assert abs(mutated.mean() - Const.MU / 5) < 5 * scale / np.sqrt(len(mutated))
+    # the standard deviation of a normal sample is within about 5 / sqrt(2n) relative error of sigma
+    assert abs(mutated.std() / scale - 1) < 5 / np.sqrt(2 * len(mutated))
+
+
+def test_mutating_never_changes_brains_handed_out():
+    stack = BrainStack.random(3, np.random.default_rng(5), Topology.legacy())
+    brain = stack.brain(0)
+    clone = brain.clone()
+    before = brain.params.copy()
+    stack.mutate(np.random.default_rng(6))
+    clone.mutate(np.random.default_rng(7))
+    assert np.array_equal(brain.params, before)
+    assert not np.array_equal(stack.params[0], before) and not np.array_equal(clone.params, before)
@@ -0,0 +1,126 @@
+"""
+author: edacjos
+created: 10/18/2026
+
+Headless training runner, e.g.
+    python train.py --generations 500 --workers 16 --seed 7 --checkpoint-dir runs/a --resume resume
+Options can also come from a JSON config file given with --config, flags win over the file.
+"""
+
+import argparse
+import json
+import time
+from brain import ACTIVATIONS
+from population import Population
+from selection import SELECTIONS
+from storage import Storage
+from support import Const
+
+
+def flag(value):
+    """A boolean option, JSON strings like "false" are rejected instead of being true"""
+    if not isinstance(value, bool):
+        raise ValueError(f'Expected true or false, got {value!r}')
+    return value
+
+
+def layer_sizes(value):
+    return tuple(int(size) for size in value)
+
+
+def activations(value):
+    """One activation name for all layers, or a tuple of one per layer"""
+    if isinstance(value, str):
+        return value
+    return value[0] if len(value) == 1 else tuple(value)
+
+
+# option name: (Const attribute, type)
+OPTIONS = {
+    'population_size': ('POPULATION_SIZE', int),
+    'mutation_rate': ('MUTATION_RATE', float),
+    'seed': ('SEED', int),
+    'workers': ('WORKERS', int),
+    'selection': ('SELECTION', str),
+    'checkpoint_dir': ('DATA_DIR', str),
+    'profile': ('PROFILE', flag),
+    'cprofile': ('CPROFILE', flag),
+    'hidden_layers': ('HIDDEN_LAYERS', layer_sizes),
+    'activations': ('ACTIVATIONS', activations),
+    'fused_activations': ('FUSED_ACTIVATIONS', flag)
+}
+# the runner never prompts, so 'ask' is not a choice
+RESUME_POLICIES = [policy for policy in Population.RESUME_POLICIES if policy != 'ask']
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Train snakes without a display.')
+    parser.add_argument('--config', help='JSON file with any of the options below')
+    parser.add_argument('--generations', type=int, help='generations to train, forever if omitted')
+    parser.add_argument('--population-size', type=int)
+    parser.add_argument('--mutation-rate', type=float)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--workers', type=int, help='processes evaluating a generation')
+    parser.add_argument('--selection', choices=sorted(SELECTIONS))
+    parser.add_argument('--checkpoint-dir', help='root directory of checkpoints and logs')
+    parser.add_argument('--profile', action='store_true', default=None,
+                        help='time the phases of every generation into the progress log')
+    parser.add_argument('--cprofile', action='store_true', default=None,
+                        help='save cProfile stats of every generation next to the progress log')
+    parser.add_argument('--hidden-layers', type=int, nargs='+', help='sizes of the hidden layers of new brains')
+    parser.add_argument('--activations', nargs='+', choices=sorted(ACTIVATIONS),
+                        help='activation of all layers, or one per layer from input to output')
+    parser.add_argument('--fused-activations', action='store_true', default=None,
+                        help='compute activations in place, sigmoid through tanh')
+    parser.add_argument('--resume', choices=RESUME_POLICIES,
+                        help='what to do with a generation saved in the checkpoint directory')
+    return parser.parse_args(argv)
+
+
+def load_options(args):
+    """Options of the config file overridden by the ones given as flags"""
+    options = {'resume': 'resume'}
+    if args.config:
+        with open(args.config, 'r') as config_file:
+            options.update({key.replace('-', '_'): value for key, value in json.load(config_file).items()})
+
+    unknown = set(options) - set(OPTIONS) - {'generations', 'resume'}
+    if unknown:
+        raise ValueError(f'Unknown options: {", ".join(sorted(unknown))}')
+
+    options.update({key: value for key, value in vars(args).items() if key != 'config' and value is not None})
+    if options['resume'] not in RESUME_POLICIES:
+        raise ValueError(f'Unknown resume policy {options["resume"]}, expected one of {", ".join(RESUME_POLICIES)}')
+    return options
+
+
+def configure(options):
+    for name, (attribute, option_type) in OPTIONS.items():
+        if options.get(name) is not None:
+            setattr(Const, attribute, option_type(options[name]))
+
+
+def train(generations=None, resume='resume'):
+    """Trains a population configured by Const, returns it closed once done"""
+    population = Population(Storage(), resume)
+    try:
+        trained = 0
+        while generations is None or trained < generations:
+            start = time.perf_counter()
+            population.run_generation()
+            trained += 1
+            print(f'Generation {population.generation_id - 1}: top fitness {population.top_fitness:.0f}, '
+                  f'top score {population.scores.max()}, {time.perf_counter() - start:.2f}s')
+    finally:
+        population.close()
+    return population
+
+
+def main(argv=None):
+    options = load_options(parse_args(argv))
+    configure(options)
+    train(options.get('generations'), options['resume'])
+
+
+if __name__ == '__main__':
+    main()